@@ -1,5 +1,7 @@
 """Use cases - Application business logic."""
-from typing import Optional, List
+import asyncio
+import uuid
+from typing import Any, AsyncIterator, Dict, Optional, List
 from datetime import datetime
 from loguru import logger
 
@@ -23,6 +25,21 @@ from app.domain.interfaces import (
 )
 
 
+
+# Client-data failures routinely produced by bad commands or malformed
+# CSV rows; logging their tracebacks adds frame-walking cost and log
+# noise without diagnostic value
+_EXPECTED_ERRORS = (ValueError, KeyError, LookupError)
+
+
+def _log_handler_error(message: str, exc: Exception) -> None:
+    """Log a handler failure, with a traceback only when it's unexpected."""
+    if isinstance(exc, _EXPECTED_ERRORS):
+        logger.error(message, exc)
+    else:
+        logger.opt(exception=True).error(message, exc)
+
+
 class ProcessCommandUseCase:
     """Use case for processing natural language commands."""
 
@@ -100,7 +117,7 @@ class ProcessCommandUseCase:
             return result
 
         except Exception as e:
-            logger.error(f"Error processing command: {str(e)}", exc_info=True)
+            _log_handler_error("Error processing command: {}", e)
             return OperationResult(
                 command_id=raw_command[:50],
                 status=OperationStatus.FAILED,
@@ -168,7 +185,7 @@ class ProcessCommandUseCase:
                 )
 
         except Exception as e:
-            logger.error(f"Error creating patient: {str(e)}", exc_info=True)
+            _log_handler_error("Error creating patient: {}", e)
             return OperationResult(
                 command_id=command.command_id,
                 status=OperationStatus.FAILED,
@@ -190,21 +207,33 @@ class ProcessCommandUseCase:
             failed = 0
             errors = []
 
+            # Pipeline the whole batch over one MLLP session instead of
+            # paying a connection per patient. A record whose message
+            # build fails is counted and skipped, so one bad patient
+            # doesn't abort the rest of the batch.
+            hl7_messages = []
+            built_patients = []
             for patient in patients:
                 try:
-                    hl7_message = await self.hl7_service.create_patient_message(patient)
-                    sent_message = await self.hl7_service.send_message(hl7_message)
-                    await self.message_repo.save_message(sent_message)
-
-                    if sent_message.ack_status == "AA":
-                        succeeded += 1
-                    else:
-                        failed += 1
-                        errors.append(f"Patient {patient.first_name} {patient.last_name}: {sent_message.ack_message}")
+                    hl7_messages.append(
+                        await self.hl7_service.create_patient_message(patient)
+                    )
+                    built_patients.append(patient)
                 except Exception as e:
                     failed += 1
                     errors.append(f"Patient {patient.first_name} {patient.last_name}: {str(e)}")
 
+            sent_messages = await self.hl7_service.send_messages(hl7_messages)
+
+            for patient, sent_message in zip(built_patients, sent_messages):
+                await self.message_repo.save_message(sent_message)
+
+                if sent_message.ack_status == "AA":
+                    succeeded += 1
+                else:
+                    failed += 1
+                    errors.append(f"Patient {patient.first_name} {patient.last_name}: {sent_message.ack_message}")
+
             status = OperationStatus.SUCCESS if failed == 0 else (
                 OperationStatus.PARTIAL_SUCCESS if succeeded > 0 else OperationStatus.FAILED
             )
@@ -222,7 +251,7 @@ class ProcessCommandUseCase:
             )
 
         except Exception as e:
-            logger.error(f"Error in bulk creation: {str(e)}", exc_info=True)
+            _log_handler_error("Error in bulk creation: {}", e)
             return OperationResult(
                 command_id=command.command_id,
                 status=OperationStatus.FAILED,
@@ -273,7 +302,7 @@ class ProcessCommandUseCase:
                 )
 
         except Exception as e:
-            logger.error(f"Error retrieving patient: {str(e)}", exc_info=True)
+            _log_handler_error("Error retrieving patient: {}", e)
             return OperationResult(
                 command_id=command.command_id,
                 status=OperationStatus.FAILED,
@@ -325,7 +354,7 @@ class ProcessCommandUseCase:
                 )
 
         except Exception as e:
-            logger.error(f"Error retrieving lab results: {str(e)}", exc_info=True)
+            _log_handler_error("Error retrieving lab results: {}", e)
             return OperationResult(
                 command_id=command.command_id,
                 status=OperationStatus.FAILED,
@@ -374,7 +403,7 @@ class ProcessCommandUseCase:
                 )
 
         except Exception as e:
-            logger.error(f"Error admitting patient: {str(e)}", exc_info=True)
+            _log_handler_error("Error admitting patient: {}", e)
             return OperationResult(
                 command_id=command.command_id,
                 status=OperationStatus.FAILED,
@@ -421,7 +450,7 @@ class ProcessCommandUseCase:
                 )
 
         except Exception as e:
-            logger.error(f"Error discharging patient: {str(e)}", exc_info=True)
+            _log_handler_error("Error discharging patient: {}", e)
             return OperationResult(
                 command_id=command.command_id,
                 status=OperationStatus.FAILED,
@@ -431,6 +460,144 @@ class ProcessCommandUseCase:
                 completed_at=datetime.utcnow(),
             )
 
+    async def _process_csv_patient(
+        self,
+        patient: Patient,
+        index: int,
+        total_count: int,
+        semaphore: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
+        """Create one CSV patient over HL7 under semaphore control."""
+        async with semaphore:
+            try:
+                # Generate MRN if not provided
+                if not patient.mrn:
+                    patient.mrn = f"CSV{uuid.uuid4().hex[:8].upper()}"
+
+                # Create HL7 message for patient
+                hl7_message = await self.hl7_service.create_patient_message(patient)
+                sent_message = await self.hl7_service.send_message(hl7_message)
+                await self.message_repo.save_message(sent_message)
+
+                # Check ACK status
+                if sent_message.ack_status == "AA":
+                    logger.debug(f"Successfully created patient {index}/{total_count}: {patient.first_name} {patient.last_name}")
+
+                    return {
+                        "success": True,
+                        "patient": patient,
+                        "index": index,
+                    }
+                else:
+                    error_msg = f"Row {patient.metadata.get('csv_row', index)}: {patient.first_name} {patient.last_name} - {sent_message.ack_message}"
+                    logger.warning(error_msg)
+                    return {
+                        "success": False,
+                        "error": error_msg,
+                        "index": index,
+                    }
+
+            except Exception as e:
+                error_msg = f"Row {patient.metadata.get('csv_row', index)}: {str(e)}"
+                logger.error(f"Error creating patient {index}/{total_count}: {str(e)}")
+                return {
+                    "success": False,
+                    "error": error_msg,
+                    "index": index,
+                }
+
+    async def execute_streaming(
+        self,
+        raw_command: str,
+        session_id: Optional[str] = None,
+        csv_patients: Optional[List[Patient]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a command, yielding per-record progress for bulk uploads.
+
+        For CSV uploads this yields one record per patient as it
+        completes, followed by a summary record, so large ingests never
+        materialize their whole result before the client sees progress.
+        Non-upload commands fall back to the buffered execute path and
+        yield its result once.
+        """
+        if not csv_patients:
+            result = await self.execute(raw_command, session_id=session_id)
+            yield {
+                "record": "summary",
+                "operation_id": result.operation_id,
+                "status": result.status.value,
+                "message": result.message,
+            }
+            return
+
+        total_count = len(csv_patients)
+        succeeded = 0
+        failed = 0
+        errors: List[str] = []
+
+        semaphore = asyncio.Semaphore(10)
+        tasks = [
+            asyncio.ensure_future(
+                self._process_csv_patient(patient, index + 1, total_count, semaphore)
+            )
+            for index, patient in enumerate(csv_patients)
+        ]
+
+        for future in asyncio.as_completed(tasks):
+            outcome = await future
+            if outcome.get("success"):
+                succeeded += 1
+                patient = outcome["patient"]
+                yield {
+                    "record": "patient",
+                    "index": outcome["index"],
+                    "status": "created",
+                    "name": f"{patient.first_name} {patient.last_name}",
+                    "mrn": patient.mrn,
+                }
+            else:
+                failed += 1
+                error_msg = outcome.get("error", "Unknown error")
+                errors.append(error_msg)
+                yield {
+                    "record": "patient",
+                    "index": outcome.get("index"),
+                    "status": "failed",
+                    "error": error_msg,
+                }
+
+        status = OperationStatus.SUCCESS if failed == 0 else (
+            OperationStatus.PARTIAL_SUCCESS if succeeded > 0 else OperationStatus.FAILED
+        )
+        result = OperationResult(
+            command_id=raw_command[:50],
+            status=status,
+            message=f"Bulk upload completed: {succeeded} succeeded, {failed} failed",
+            errors=errors[:10],
+            protocol_used=Protocol.HL7V2,
+            records_affected=total_count,
+            records_succeeded=succeeded,
+            records_failed=failed,
+            completed_at=datetime.utcnow(),
+        )
+        await self.operation_repo.save_operation(result)
+        if session_id:
+            context = await self.context_repo.get_context(session_id)
+            if not context:
+                context = ConversationContext(session_id=session_id)
+            context.add_operation_result(result)
+            await self.context_repo.save_context(context)
+
+        yield {
+            "record": "summary",
+            "operation_id": result.operation_id,
+            "status": result.status.value,
+            "total": total_count,
+            "succeeded": succeeded,
+            "failed": failed,
+        }
+
     async def _handle_csv_upload(self, patients: List[Patient], raw_command: str) -> OperationResult:
         """
         Handle bulk patient creation from CSV upload with concurrent processing (URS PR-2).
@@ -452,50 +619,9 @@ class ProcessCommandUseCase:
             MAX_CONCURRENT = 10
             semaphore = asyncio.Semaphore(MAX_CONCURRENT)
 
-            async def process_single_patient(patient: Patient, index: int):
-                """Process a single patient with semaphore control."""
-                async with semaphore:
-                    try:
-                        # Generate MRN if not provided
-                        if not patient.mrn:
-                            import uuid
-                            patient.mrn = f"CSV{uuid.uuid4().hex[:8].upper()}"
-
-                        # Create HL7 message for patient
-                        hl7_message = await self.hl7_service.create_patient_message(patient)
-                        sent_message = await self.hl7_service.send_message(hl7_message)
-                        await self.message_repo.save_message(sent_message)
-
-                        # Check ACK status
-                        if sent_message.ack_status == "AA":
-                            logger.debug(f"Successfully created patient {index}/{total_count}: {patient.first_name} {patient.last_name}")
-
-                            return {
-                                "success": True,
-                                "patient": patient,
-                                "index": index,
-                            }
-                        else:
-                            error_msg = f"Row {patient.metadata.get('csv_row', index)}: {patient.first_name} {patient.last_name} - {sent_message.ack_message}"
-                            logger.warning(error_msg)
-                            return {
-                                "success": False,
-                                "error": error_msg,
-                                "index": index,
-                            }
-
-                    except Exception as e:
-                        error_msg = f"Row {patient.metadata.get('csv_row', index)}: {str(e)}"
-                        logger.error(f"Error creating patient {index}/{total_count}: {str(e)}")
-                        return {
-                            "success": False,
-                            "error": error_msg,
-                            "index": index,
-                        }
-
             # Process all patients concurrently
             tasks = [
-                process_single_patient(patient, index + 1)
+                self._process_csv_patient(patient, index + 1, total_count, semaphore)
                 for index, patient in enumerate(patients)
             ]
 
@@ -574,7 +700,7 @@ class ProcessCommandUseCase:
             )
 
         except Exception as e:
-            logger.error(f"Error processing CSV upload: {str(e)}", exc_info=True)
+            _log_handler_error("Error processing CSV upload: {}", e)
             return OperationResult(
                 command_id=raw_command[:50],
                 status=OperationStatus.FAILED,
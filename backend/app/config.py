@@ -56,6 +56,9 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Uploads
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024  # 10 MB cap on CSV/Excel/PDF uploads
+
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/interface-wizard.log"
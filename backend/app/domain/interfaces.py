@@ -1,6 +1,6 @@
 """Domain interfaces (ports) for dependency inversion."""
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from app.domain.entities import (
     UserCommand,
     OperationResult,
@@ -46,6 +46,22 @@ class INLPService(ABC):
         """
         pass
 
+    @abstractmethod
+    def generate_response_stream(
+        self, operation_result: OperationResult, context: Optional[ConversationContext] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a human-friendly response as it is generated.
+
+        Args:
+            operation_result: The result of the operation
+            context: Optional conversation context
+
+        Returns:
+            Async iterator of response text fragments
+        """
+        pass
+
 
 class IHL7Service(ABC):
     """Interface for HL7 v2 messaging service."""
@@ -76,7 +92,12 @@ class IHL7Service(ABC):
         pass
 
     @abstractmethod
-    async def parse_ack(self, ack_content: str) -> Dict[str, Any]:
+    async def send_messages(self, messages: List[HL7Message]) -> List[HL7Message]:
+        """Send multiple HL7 messages over one MLLP session, pipelined."""
+        pass
+
+    @abstractmethod
+    def parse_ack(self, ack_content: str) -> Dict[str, Any]:
         """Parse ACK message and extract status."""
         pass
 
@@ -104,11 +125,26 @@ class IFHIRService(ABC):
         """Create an observation (lab result) using FHIR API."""
         pass
 
+    @abstractmethod
+    async def create_patients_bundle(self, patients: List[Patient]) -> List[Dict[str, Any]]:
+        """Create multiple patients in a single FHIR transaction Bundle."""
+        pass
+
+    @abstractmethod
+    async def create_observations_bundle(self, lab_results: List[LabResult]) -> List[Dict[str, Any]]:
+        """Create multiple observations in a single FHIR transaction Bundle."""
+        pass
+
     @abstractmethod
     async def get_observations(self, patient_id: str, params: Optional[Dict[str, Any]] = None) -> List[LabResult]:
         """Retrieve observations for a patient."""
         pass
 
+    @abstractmethod
+    async def get_observations_many(self, patient_ids: List[str]) -> Dict[str, List[LabResult]]:
+        """Retrieve observations for multiple patients concurrently."""
+        pass
+
 
 class IDataGeneratorService(ABC):
     """Interface for test data generation service."""
@@ -4,12 +4,54 @@ Handles file parsing and conversion to Patient entities
 """
 import csv
 import io
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, Optional
 from datetime import datetime
 from loguru import logger
 
 from app.domain.entities import Patient
 
+# Bump when the compiled parser shape changes so stale cached parsers are not reused
+_PARSER_VERSION = 1
+
+
+@lru_cache(maxsize=32)
+def _compile_row_parser(headers: tuple, version: int = _PARSER_VERSION) -> Optional[Callable]:
+    """
+    Compile a specialized row parser for a canonical CSV schema.
+
+    A schema is canonical when every header is already a Patient field name
+    (e.g. CSV exports produced by the app itself). In that case the generic
+    column-mapping walk can be skipped entirely: the generated function pulls
+    each field by its literal column index.
+
+    Args:
+        headers: CSV header row as a tuple (cache key)
+        version: Parser format version (cache key)
+
+    Returns:
+        Compiled parser taking a raw row list and returning a field dict,
+        or None if the schema is not canonical
+    """
+    field_indices = []
+    for idx, header in enumerate(headers):
+        field_name = header.lower().strip()
+        if field_name not in CSVProcessingService.FIELD_MAPPINGS:
+            return None
+        field_indices.append((field_name, idx))
+
+    # Build the parser source with literal indices baked in
+    lines = ["def parse_row(row):", "    data = {}"]
+    for field_name, idx in field_indices:
+        lines.append(f"    value = row[{idx}].strip()")
+        lines.append("    if value:")
+        lines.append(f"        data[{field_name!r}] = value")
+    lines.append("    return data")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["parse_row"]
+
 
 class CSVProcessingService:
     """Service to process CSV files containing patient data"""
@@ -61,13 +103,28 @@ class CSVProcessingService:
         Raises:
             ValueError: If CSV format is invalid or required fields are missing
         """
-        try:
-            # Decode bytes to string
-            csv_string = csv_content.decode(encoding)
+        return self.parse_csv_stream(io.BytesIO(csv_content), encoding)
 
-            # Parse CSV using DictReader
-            csv_file = io.StringIO(csv_string)
-            reader = csv.DictReader(csv_file)
+    def parse_csv_stream(self, fileobj, encoding: str = 'utf-8') -> List[Patient]:
+        """
+        Parse CSV rows straight from a binary file object.
+
+        Rows are decoded and parsed as they are read, so uploads never
+        need to be buffered fully in memory first.
+
+        Args:
+            fileobj: Binary file-like object positioned at the start
+            encoding: File encoding (default: utf-8)
+
+        Returns:
+            List of Patient entities parsed from CSV
+
+        Raises:
+            ValueError: If CSV format is invalid or required fields are missing
+        """
+        text = io.TextIOWrapper(fileobj, encoding=encoding, newline='')
+        try:
+            reader = csv.DictReader(text)
 
             # Check if CSV has headers
             if not reader.fieldnames:
@@ -75,6 +132,16 @@ class CSVProcessingService:
 
             logger.info(f"CSV headers detected: {reader.fieldnames}")
 
+            # Fast path: canonical schemas get a compiled index-based parser
+            fast_parser = _compile_row_parser(tuple(reader.fieldnames))
+            if fast_parser:
+                logger.info("Canonical CSV schema detected, using specialized parser")
+                # reader.reader is the underlying csv.reader, already past
+                # the header row
+                return self._parse_canonical_rows(
+                    reader.reader, fast_parser, len(reader.fieldnames)
+                )
+
             # Build column mapping
             column_mapping = self._build_column_mapping(reader.fieldnames)
             logger.info(f"Column mapping: {column_mapping}")
@@ -100,6 +167,42 @@ class CSVProcessingService:
         except Exception as e:
             logger.error(f"Error parsing CSV: {str(e)}")
             raise ValueError(f"Failed to parse CSV file: {str(e)}")
+        finally:
+            # Hand the underlying file back to the caller without closing it
+            text.detach()
+
+    def _parse_canonical_rows(
+        self,
+        rows,
+        parser: Callable,
+        column_count: int
+    ) -> List[Patient]:
+        """
+        Parse CSV rows using a compiled parser for a canonical schema.
+
+        Args:
+            rows: Iterable of raw CSV rows (header already consumed)
+            parser: Compiled row parser from _compile_row_parser
+            column_count: Number of columns in the header row
+
+        Returns:
+            List of Patient entities parsed from CSV
+        """
+        patients = []
+        for row_num, row in enumerate(rows, start=2):
+            try:
+                # Pad short rows so the index-based parser stays in bounds
+                if len(row) < column_count:
+                    row = row + [''] * (column_count - len(row))
+                patient = self._patient_from_fields(parser(row), row_num)
+                if patient:
+                    patients.append(patient)
+            except Exception as e:
+                logger.warning(f"Skipping row {row_num}: {str(e)}")
+                continue
+
+        logger.info(f"Successfully parsed {len(patients)} patients from CSV")
+        return patients
 
     def _build_column_mapping(self, headers: List[str]) -> Dict[str, str]:
         """
@@ -152,6 +255,26 @@ class CSVProcessingService:
             if value:
                 patient_data[patient_field] = value
 
+        return self._patient_from_fields(patient_data, row_num)
+
+    def _patient_from_fields(
+        self,
+        patient_data: Dict[str, str],
+        row_num: int
+    ) -> Optional[Patient]:
+        """
+        Build a Patient entity from extracted field values.
+
+        Args:
+            patient_data: Mapping of patient field names to raw values
+            row_num: Row number for error reporting
+
+        Returns:
+            Patient entity or None if required fields are missing
+        """
+        if not patient_data:
+            return None
+
         # Validate required fields
         if not patient_data.get('first_name') and not patient_data.get('last_name'):
             logger.warning(f"Row {row_num}: Missing required name fields")
@@ -323,6 +446,22 @@ class CSVProcessingService:
         Returns:
             List of Patient entities parsed from Excel
 
+        Raises:
+            ValueError: If Excel format is invalid or required fields are missing
+        """
+        return self.parse_excel_stream(io.BytesIO(excel_content), file_ext)
+
+    def parse_excel_stream(self, fileobj, file_ext: str = 'xlsx') -> List[Patient]:
+        """
+        Parse an Excel file straight from a binary file object.
+
+        Args:
+            fileobj: Binary file-like object positioned at the start
+            file_ext: File extension ('xlsx' or 'xls')
+
+        Returns:
+            List of Patient entities parsed from Excel
+
         Raises:
             ValueError: If Excel format is invalid or required fields are missing
         """
@@ -332,8 +471,9 @@ class CSVProcessingService:
 
             # Parse Excel file based on format
             if file_ext == 'xlsx':
-                # Modern Excel format (.xlsx)
-                wb = openpyxl.load_workbook(io.BytesIO(excel_content), read_only=True)
+                # Modern Excel format (.xlsx); openpyxl reads the zip
+                # archive from the file object without a bytes copy
+                wb = openpyxl.load_workbook(fileobj, read_only=True)
                 sheet = wb.active
 
                 # Extract headers from first row
@@ -346,8 +486,8 @@ class CSVProcessingService:
                     rows.append(row_dict)
 
             elif file_ext == 'xls':
-                # Legacy Excel format (.xls)
-                wb = xlrd.open_workbook(file_contents=excel_content)
+                # Legacy Excel format (.xls); xlrd only takes bytes
+                wb = xlrd.open_workbook(file_contents=fileobj.read())
                 sheet = wb.sheet_by_index(0)
 
                 # Extract headers from first row
@@ -400,6 +540,21 @@ class CSVProcessingService:
         Returns:
             List of Patient entities parsed from PDF
 
+        Raises:
+            ValueError: If PDF format is invalid or no data can be extracted
+        """
+        return self.parse_pdf_stream(io.BytesIO(pdf_content))
+
+    def parse_pdf_stream(self, fileobj) -> List[Patient]:
+        """
+        Parse a PDF file straight from a binary file object.
+
+        Args:
+            fileobj: Binary file-like object positioned at the start
+
+        Returns:
+            List of Patient entities parsed from PDF
+
         Raises:
             ValueError: If PDF format is invalid or no data can be extracted
         """
@@ -407,7 +562,7 @@ class CSVProcessingService:
             import pdfplumber
 
             # Open PDF
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+            with pdfplumber.open(fileobj) as pdf:
                 all_rows = []
 
                 # Extract tables from all pages
@@ -0,0 +1,34 @@
+"""In-process DNS cache for outbound connections."""
+import asyncio
+import random
+import socket
+from typing import Dict, Tuple
+
+# Cached lookups as (expiry on the loop clock, resolved IP). A ~60 s TTL
+# with jitter avoids one getaddrinfo thread-pool hop and UDP round-trip
+# per outbound MLLP send or health probe, without pinning a stale address
+# for long after a failover.
+_TTL_SECONDS = 60.0
+_cache: Dict[Tuple[str, int], Tuple[float, str]] = {}
+
+
+async def resolve(host: str, port: int) -> str:
+    """Resolve host to an IP address, caching the result for ~60 seconds."""
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+
+    entry = _cache.get((host, port))
+    if entry is not None:
+        expires_at, address = entry
+        if now < expires_at:
+            return address
+
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    address = infos[0][4][0]
+    _cache[(host, port)] = (now + _TTL_SECONDS + random.uniform(0, 10), address)
+    return address
+
+
+def invalidate(host: str, port: int) -> None:
+    """Drop a cached address, e.g. after a connect failure."""
+    _cache.pop((host, port), None)
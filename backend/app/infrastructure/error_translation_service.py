@@ -1,11 +1,18 @@
 """Error Translation Service - Converts technical errors to plain language."""
-from typing import Dict, Any, Optional, List
+import re
+from collections import defaultdict, deque, namedtuple
+from typing import Dict, Any, Optional, List, Set
 from dataclasses import dataclass
 from loguru import logger
 
 from app.domain.entities import OperationResult, OperationStatus
 
 
+# Precompiled error-pattern record: tuple iteration with attribute access is
+# cheaper than walking a dict of dicts on the hot path
+ErrorPatternEntry = namedtuple("ErrorPatternEntry", "key regex template suggestions")
+
+
 @dataclass
 class ErrorContext:
     """Context information for error translation."""
@@ -17,6 +24,170 @@ class ErrorContext:
     technical_details: Optional[Dict[str, Any]] = None
 
 
+class _KeywordAutomaton:
+    """
+    Minimal Aho-Corasick automaton over lowercase keyword literals.
+
+    Finds every keyword in a single pass over the input, so translate_error
+    pays one scan of the message instead of one regex scan per error type.
+    """
+
+    def __init__(self, keywords: Dict[str, str]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        # Build the keyword trie
+        for word, label in keywords.items():
+            state = 0
+            for char in word:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    next_state = len(self._goto) - 1
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].append(label)
+
+        # Build failure links breadth-first
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def find(self, text: str) -> Set[str]:
+        """Return the labels of all keywords occurring in text."""
+        labels = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                labels.update(self._output[state])
+        return labels
+
+
+# Map of error patterns to user-friendly messages
+_RAW_ERROR_PATTERNS = {
+    'duplicate': {
+        'pattern': r'duplicate|already exists|unique constraint',
+        'template': "I couldn't create {entity} because {identifier} already exists in the system. {suggestion}",
+        'suggestions': [
+            "Would you like to update the existing record instead?",
+            "Try using a different Medical Record Number (MRN).",
+            "Check if this patient was created previously."
+        ]
+    },
+    'missing_field': {
+        'pattern': r'required field|missing|cannot be null|not provided',
+        'template': "{field_name} is required to {action}. {suggestion}",
+        'suggestions': [
+            "Please provide the missing information and try again.",
+            "You can add this information by including it in your command."
+        ]
+    },
+    'invalid_format': {
+        'pattern': r'invalid format|malformed|incorrect format',
+        'template': "The {field_name} you provided doesn't match the expected format. {suggestion}",
+        'suggestions': [
+            "Please check the format and try again.",
+            "For dates, use YYYY-MM-DD format (e.g., 1990-05-15).",
+            "For phone numbers, use XXX-XXX-XXXX format."
+        ]
+    },
+    'connection_error': {
+        'pattern': r'connection refused|timeout|network|unreachable',
+        'template': "I'm having trouble connecting to the healthcare system. {suggestion}",
+        'suggestions': [
+            "Please check if Mirth Connect is running.",
+            "Verify that the MLLP port (6661) is accessible.",
+            "Try again in a moment - this might be a temporary issue."
+        ]
+    },
+    'ack_error': {
+        'pattern': r'ACK.*error|AE|AR|rejected',
+        'template': "The healthcare system rejected the patient record. {reason} {suggestion}",
+        'suggestions': [
+            "Please check the error details and correct any issues.",
+            "Contact your system administrator if this persists."
+        ]
+    },
+    'validation_error': {
+        'pattern': r'validation|invalid|not allowed',
+        'template': "{field_name} validation failed. {reason} {suggestion}",
+        'suggestions': [
+            "Please review the data and make corrections.",
+            "Ensure all required fields are provided with valid values."
+        ]
+    }
+}
+
+# Precompiled flat records in declaration order for hot-path iteration,
+# built once at import and shared by every service instance
+_ERROR_PATTERNS = tuple(
+    ErrorPatternEntry(
+        key,
+        re.compile(config['pattern'], re.IGNORECASE),
+        config['template'],
+        tuple(config['suggestions']),
+    )
+    for key, config in _RAW_ERROR_PATTERNS.items()
+)
+
+_FIELD_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), name)
+    for pattern, name in [
+        (r'first.?name', 'First Name'),
+        (r'last.?name', 'Last Name'),
+        (r'date.?of.?birth|dob', 'Date of Birth'),
+        (r'mrn|medical.?record', 'Medical Record Number'),
+        (r'ssn|social.?security', 'Social Security Number'),
+        (r'phone|telephone', 'Phone Number'),
+        (r'email', 'Email Address'),
+        (r'address', 'Address'),
+    ]
+)
+
+# Keyword automaton matching all literal error-pattern alternations in
+# one pass; only the non-literal ACK pattern still needs a regex
+_KEYWORD_AUTOMATON = _KeywordAutomaton({
+    'duplicate': 'duplicate',
+    'already exists': 'duplicate',
+    'unique constraint': 'duplicate',
+    'required field': 'missing_field',
+    'missing': 'missing_field',
+    'cannot be null': 'missing_field',
+    'not provided': 'missing_field',
+    'invalid format': 'invalid_format',
+    'malformed': 'invalid_format',
+    'incorrect format': 'invalid_format',
+    'connection refused': 'connection_error',
+    'timeout': 'connection_error',
+    'network': 'connection_error',
+    'unreachable': 'connection_error',
+    'ae': 'ack_error',
+    'ar': 'ack_error',
+    'rejected': 'ack_error',
+    'validation': 'validation_error',
+    'invalid': 'validation_error',
+    'not allowed': 'validation_error',
+})
+_ACK_FALLBACK_RE = re.compile(r'ACK.*error', re.IGNORECASE)
+
+_FIELD_NAME_RE = re.compile(r"'(\w+)'|\"(\w+)\"")
+_SQL_RE = re.compile(r'SQL:.*', re.IGNORECASE)
+_PATH_RE = re.compile(r'[\/\\][\w\/\\]+\.py')
+
+
 class ErrorTranslationService:
     """
     Service for translating technical errors into user-friendly messages.
@@ -25,62 +196,21 @@ class ErrorTranslationService:
     """
 
     def __init__(self):
-        # Map of error patterns to user-friendly messages
-        self.error_patterns = {
-            'duplicate': {
-                'pattern': r'duplicate|already exists|unique constraint',
-                'template': "I couldn't create {entity} because {identifier} already exists in the system. {suggestion}",
-                'suggestions': [
-                    "Would you like to update the existing record instead?",
-                    "Try using a different Medical Record Number (MRN).",
-                    "Check if this patient was created previously."
-                ]
-            },
-            'missing_field': {
-                'pattern': r'required field|missing|cannot be null|not provided',
-                'template': "{field_name} is required to {action}. {suggestion}",
-                'suggestions': [
-                    "Please provide the missing information and try again.",
-                    "You can add this information by including it in your command."
-                ]
-            },
-            'invalid_format': {
-                'pattern': r'invalid format|malformed|incorrect format',
-                'template': "The {field_name} you provided doesn't match the expected format. {suggestion}",
-                'suggestions': [
-                    "Please check the format and try again.",
-                    "For dates, use YYYY-MM-DD format (e.g., 1990-05-15).",
-                    "For phone numbers, use XXX-XXX-XXXX format."
-                ]
-            },
-            'connection_error': {
-                'pattern': r'connection refused|timeout|network|unreachable',
-                'template': "I'm having trouble connecting to the healthcare system. {suggestion}",
-                'suggestions': [
-                    "Please check if Mirth Connect is running.",
-                    "Verify that the MLLP port (6661) is accessible.",
-                    "Try again in a moment - this might be a temporary issue."
-                ]
-            },
-            'ack_error': {
-                'pattern': r'ACK.*error|AE|AR|rejected',
-                'template': "The healthcare system rejected the patient record. {reason} {suggestion}",
-                'suggestions': [
-                    "Please check the error details and correct any issues.",
-                    "Contact your system administrator if this persists."
-                ]
-            },
-            'validation_error': {
-                'pattern': r'validation|invalid|not allowed',
-                'template': "{field_name} validation failed. {reason} {suggestion}",
-                'suggestions': [
-                    "Please review the data and make corrections.",
-                    "Ensure all required fields are provided with valid values."
-                ]
-            }
-        }
+        # All pattern tables are module-level constants compiled at import;
+        # only the suggestion-rotation cursor is per-instance state
+        self._patterns = _ERROR_PATTERNS
+        self._field_patterns = _FIELD_PATTERNS
+        self._keyword_automaton = _KEYWORD_AUTOMATON
+        self._ack_fallback_re = _ACK_FALLBACK_RE
 
-    async def translate_error(
+        # Per-type cursor for round-robin suggestion rotation
+        self._suggestion_cursor = defaultdict(int)
+
+        self._field_name_re = _FIELD_NAME_RE
+        self._sql_re = _SQL_RE
+        self._path_re = _PATH_RE
+
+    def translate_error(
         self,
         error: Exception,
         context: Optional[ErrorContext] = None
@@ -98,16 +228,20 @@ class ErrorTranslationService:
         error_message = str(error)
         context = context or ErrorContext(error_message=error_message)
 
-        # Try to match error pattern
-        for error_type, config in self.error_patterns.items():
-            import re
-            if re.search(config['pattern'], error_message, re.IGNORECASE):
-                return await self._format_error_message(error_type, config, context)
+        # Single-pass keyword scan across all literal patterns
+        matched_types = self._keyword_automaton.find(error_message.lower())
+        if self._ack_fallback_re.search(error_message):
+            matched_types.add('ack_error')
+
+        # First matching type in declaration order wins, as before
+        for entry in self._patterns:
+            if entry.key in matched_types:
+                return self._format_error_message(entry, context)
 
         # Default fallback message
         return self._create_default_message(error_message, context)
 
-    async def translate_ack_error(
+    def translate_ack_error(
         self,
         ack_status: str,
         ack_message: str,
@@ -142,14 +276,15 @@ class ErrorTranslationService:
 
         message = f"{status_text} {entity}."
 
-        # Extract error details from ACK message
-        if "duplicate" in ack_message.lower():
+        # Extract error details from ACK message (lowercase once, not per check)
+        msg_lower = ack_message.lower()
+        if "duplicate" in msg_lower:
             message += " The patient already exists in the system."
             message += " Would you like to update the existing record instead, or use a different identifier?"
-        elif "required" in ack_message.lower() or "missing" in ack_message.lower():
+        elif "required" in msg_lower or "missing" in msg_lower:
             message += " Some required information is missing."
             message += " Please provide all necessary fields and try again."
-        elif "invalid" in ack_message.lower():
+        elif "invalid" in msg_lower:
             message += " Some of the data provided is in an invalid format."
             message += " Please check your input and ensure all fields match the expected format."
         else:
@@ -158,7 +293,7 @@ class ErrorTranslationService:
 
         return message
 
-    async def create_validation_error_message(
+    def create_validation_error_message(
         self,
         validation_errors: List[str],
         validation_warnings: List[str],
@@ -182,14 +317,18 @@ class ErrorTranslationService:
 
         if validation_errors:
             message_parts.append("I found some issues that need to be fixed:")
-            for idx, error in enumerate(validation_errors[:5], 1):  # Limit to 5
-                message_parts.append(f"  {idx}. {error}")
+            message_parts.extend(
+                f"  {idx}. {error}"
+                for idx, error in enumerate(validation_errors[:5], 1)  # Limit to 5
+            )
 
             # Add field-specific guidance
             if field_issues:
                 message_parts.append("\nHere's how to fix them:")
-                for field, issues in list(field_issues.items())[:3]:  # Limit to 3 fields
-                    message_parts.append(f"  • {field}: {issues[0]}")
+                message_parts.extend(
+                    f"  • {field}: {issues[0]}"
+                    for field, issues in list(field_issues.items())[:3]  # Limit to 3 fields
+                )
 
         if validation_warnings:
             if validation_errors:
@@ -197,8 +336,10 @@ class ErrorTranslationService:
             else:
                 message_parts.append("I noticed some potential issues:")
 
-            for idx, warning in enumerate(validation_warnings[:3], 1):
-                message_parts.append(f"  {idx}. {warning}")
+            message_parts.extend(
+                f"  {idx}. {warning}"
+                for idx, warning in enumerate(validation_warnings[:3], 1)
+            )
 
         # Add helpful suggestion
         if validation_errors:
@@ -208,7 +349,7 @@ class ErrorTranslationService:
 
         return "\n".join(message_parts)
 
-    async def create_success_message(
+    def create_success_message(
         self,
         operation_result: OperationResult,
         include_details: bool = True
@@ -254,17 +395,17 @@ class ErrorTranslationService:
 
         return " ".join(message_parts)
 
-    async def _format_error_message(
+    def _format_error_message(
         self,
-        error_type: str,
-        config: Dict[str, Any],
+        entry: ErrorPatternEntry,
         context: ErrorContext
     ) -> str:
         """Format error message using template and context."""
-        import random
-
-        # Select a suggestion
-        suggestion = random.choice(config['suggestions'])
+        # Rotate suggestions deterministically so repeated errors cycle
+        # through the guidance without per-call PRNG work
+        idx = self._suggestion_cursor[entry.key]
+        suggestion = entry.suggestions[idx % len(entry.suggestions)]
+        self._suggestion_cursor[entry.key] = idx + 1
 
         # Build entity description
         entity = "patient record"
@@ -283,7 +424,7 @@ class ErrorTranslationService:
         action = context.operation_type or "complete this operation"
 
         # Format the template
-        message = config['template'].format(
+        message = entry.template.format(
             entity=entity,
             identifier=identifier,
             field_name=field_name,
@@ -317,46 +458,30 @@ class ErrorTranslationService:
 
     def _extract_field_name(self, error_message: str) -> str:
         """Extract field name from error message."""
-        import re
-
         # Try to find field name in quotes
-        match = re.search(r"'(\w+)'|\"(\w+)\"", error_message)
+        match = self._field_name_re.search(error_message)
         if match:
             return match.group(1) or match.group(2)
 
         # Try to find common field patterns
-        field_patterns = {
-            r'first.?name': 'First Name',
-            r'last.?name': 'Last Name',
-            r'date.?of.?birth|dob': 'Date of Birth',
-            r'mrn|medical.?record': 'Medical Record Number',
-            r'ssn|social.?security': 'Social Security Number',
-            r'phone|telephone': 'Phone Number',
-            r'email': 'Email Address',
-            r'address': 'Address',
-        }
-
-        for pattern, name in field_patterns.items():
-            if re.search(pattern, error_message, re.IGNORECASE):
+        for pattern, name in self._field_patterns:
+            if pattern.search(error_message):
                 return name
 
         return "the required field"
 
     def _simplify_error_message(self, error_message: str) -> str:
         """Simplify technical error message."""
-        # Remove technical stack traces
-        if '\n' in error_message:
-            error_message = error_message.split('\n')[0]
+        # Keep only the first line (drops stack traces in one pass)
+        error_message = error_message.partition('\n')[0]
 
-        # Remove SQL statements
-        import re
-        error_message = re.sub(r'SQL:.*', '', error_message, flags=re.IGNORECASE)
+        # Remove SQL statements; search first so clean messages skip the sub
+        if self._sql_re.search(error_message):
+            error_message = self._sql_re.sub('', error_message)
 
         # Remove file paths
-        error_message = re.sub(r'[\/\\][\w\/\\]+\.py', '', error_message)
+        if self._path_re.search(error_message):
+            error_message = self._path_re.sub('', error_message)
 
         # Capitalize first letter
-        if error_message:
-            error_message = error_message[0].upper() + error_message[1:]
-
-        return error_message
+        return error_message[:1].upper() + error_message[1:]
@@ -1,6 +1,10 @@
 """FHIR API Service implementation."""
+import asyncio
+from dataclasses import fields
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 import httpx
+import orjson
 from loguru import logger
 from datetime import datetime
 
@@ -9,26 +13,126 @@ from app.domain.entities import Patient, LabResult
 from app.domain.interfaces import IFHIRService
 
 
+@lru_cache(maxsize=1024)
+def _observation_template(test_code: str, test_name: str, status: str) -> bytes:
+    """
+    Pre-serialized Observation skeleton for a (code, name, status) combination.
+
+    LOINC code/name pairs repeat heavily in lab-result streams, so the static
+    part of the resource is cached once per combination and rehydrated with
+    orjson.loads, which is cheaper than rebuilding the nested dicts per call.
+    """
+    return orjson.dumps({
+        "resourceType": "Observation",
+        "status": status,
+        "code": {
+            "coding": [
+                {
+                    "system": "http://loinc.org",
+                    "code": test_code,
+                    "display": test_name,
+                }
+            ]
+        },
+    })
+
+
+# Optional scalar Patient fields and the converter line emitted for each;
+# compound name/telecom/address handling is emitted as fixed blocks below
+_PATIENT_FIELD_SNIPPETS = [
+    ("gender", "        fhir_patient['gender'] = patient.gender.lower()"),
+    ("date_of_birth", "        fhir_patient['birthDate'] = patient.date_of_birth.strftime('%Y-%m-%d')"),
+    ("phone", "        fhir_patient['telecom'] = [{'system': 'phone', 'value': patient.phone, 'use': 'home'}]"),
+]
+
+
+def _compile_patient_to_fhir():
+    """
+    Compile the Patient -> FHIR Patient converter into straight-line code.
+
+    The Patient schema is fixed at startup, so the converter is generated
+    once with every field check inlined; the spec above is validated against
+    the dataclass fields so schema drift fails loudly at import time.
+    """
+    valid_fields = {f.name for f in fields(Patient)}
+
+    lines = [
+        "def convert(patient):",
+        "    fhir_patient = {",
+        "        'resourceType': 'Patient',",
+        "        'identifier': [",
+        "            {'system': 'urn:oid:2.16.840.1.113883.19.5', 'value': patient.mrn or ''}",
+        "        ],",
+        "        'name': [",
+        "            {'use': 'official', 'family': patient.last_name or '', 'given': [patient.first_name or '']}",
+        "        ],",
+        "    }",
+        "    if patient.middle_name:",
+        "        fhir_patient['name'][0]['given'].append(patient.middle_name)",
+    ]
+
+    for field_name, snippet in _PATIENT_FIELD_SNIPPETS:
+        if field_name not in valid_fields:
+            raise AttributeError(f"Patient has no field {field_name!r}")
+        lines.append(f"    if patient.{field_name}:")
+        lines.append(snippet)
+
+    lines += [
+        "    if patient.email:",
+        "        if 'telecom' not in fhir_patient:",
+        "            fhir_patient['telecom'] = []",
+        "        fhir_patient['telecom'].append({'system': 'email', 'value': patient.email})",
+        "    if patient.address:",
+        "        fhir_patient['address'] = [{",
+        "            'use': 'home',",
+        "            'line': [patient.address],",
+        "            'city': patient.city or '',",
+        "            'state': patient.state or '',",
+        "            'postalCode': patient.zip_code or '',",
+        "        }]",
+        "    return fhir_patient",
+    ]
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["convert"]
+
+
+_patient_to_fhir_compiled = _compile_patient_to_fhir()
+
+
 class FHIRAPIService(IFHIRService):
     """FHIR R4 API service implementation."""
 
     def __init__(self):
         self.base_url = settings.FHIR_BASE_URL
         self.timeout = 30.0
+        # Shared client with keep-alive so repeated calls reuse connections
+        # instead of paying a TCP+TLS handshake per request
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http2=True,
+            headers={"Accept": "application/fhir+json"},
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on app shutdown)."""
+        await self._client.aclose()
 
     async def create_patient(self, patient: Patient) -> Dict[str, Any]:
         """Create a patient using FHIR API."""
         try:
             fhir_patient = self._patient_to_fhir(patient)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/Patient",
-                    json=fhir_patient,
-                    headers={"Content-Type": "application/fhir+json"},
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._client.post(
+                "/Patient",
+                content=orjson.dumps(fhir_patient),
+                headers={"Content-Type": "application/fhir+json"},
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
 
         except Exception as e:
             logger.error(f"Error creating FHIR patient: {str(e)}", exc_info=True)
@@ -37,18 +141,14 @@ class FHIRAPIService(IFHIRService):
     async def get_patient(self, patient_id: str) -> Optional[Patient]:
         """Retrieve a patient using FHIR API."""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/Patient/{patient_id}",
-                    headers={"Accept": "application/fhir+json"},
-                )
+            response = await self._client.get(f"/Patient/{patient_id}")
 
-                if response.status_code == 404:
-                    return None
+            if response.status_code == 404:
+                return None
 
-                response.raise_for_status()
-                fhir_data = response.json()
-                return self._fhir_to_patient(fhir_data)
+            response.raise_for_status()
+            fhir_data = orjson.loads(response.content)
+            return self._fhir_to_patient(fhir_data)
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -62,23 +162,23 @@ class FHIRAPIService(IFHIRService):
     async def search_patients(self, search_params: Dict[str, Any]) -> List[Patient]:
         """Search for patients using FHIR API."""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/Patient",
-                    params=search_params,
-                    headers={"Accept": "application/fhir+json"},
-                )
+            # Stream the search bundle so httpx hands back one raw byte
+            # buffer for orjson instead of eagerly decoding the body
+            async with self._client.stream(
+                "GET", "/Patient", params=search_params
+            ) as response:
                 response.raise_for_status()
+                content = await response.aread()
 
-                bundle = response.json()
-                patients = []
-
-                if bundle.get("resourceType") == "Bundle" and bundle.get("entry"):
-                    for entry in bundle["entry"]:
-                        if entry.get("resource"):
-                            patients.append(self._fhir_to_patient(entry["resource"]))
+            bundle = orjson.loads(content)
+            if bundle.get("resourceType") != "Bundle":
+                return []
 
-                return patients
+            return [
+                self._fhir_to_patient(entry["resource"])
+                for entry in bundle.get("entry") or ()
+                if entry.get("resource")
+            ]
 
         except Exception as e:
             logger.error(f"Error searching FHIR patients: {str(e)}", exc_info=True)
@@ -89,19 +189,76 @@ class FHIRAPIService(IFHIRService):
         try:
             fhir_observation = self._lab_result_to_fhir(lab_result)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/Observation",
-                    json=fhir_observation,
-                    headers={"Content-Type": "application/fhir+json"},
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._client.post(
+                "/Observation",
+                content=orjson.dumps(fhir_observation),
+                headers={"Content-Type": "application/fhir+json"},
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
 
         except Exception as e:
             logger.error(f"Error creating FHIR observation: {str(e)}", exc_info=True)
             raise
 
+    async def create_patients_bundle(self, patients: List[Patient]) -> List[Dict[str, Any]]:
+        """Create multiple patients in a single FHIR transaction Bundle."""
+        try:
+            bundle = {
+                "resourceType": "Bundle",
+                "type": "transaction",
+                "entry": [
+                    {
+                        "resource": self._patient_to_fhir(patient),
+                        "request": {"method": "POST", "url": "Patient"},
+                    }
+                    for patient in patients
+                ],
+            }
+
+            response = await self._client.post(
+                "",
+                content=orjson.dumps(bundle),
+                headers={"Content-Type": "application/fhir+json"},
+            )
+            response.raise_for_status()
+
+            result = orjson.loads(response.content)
+            return [entry.get("response", {}) for entry in result.get("entry", [])]
+
+        except Exception as e:
+            logger.error(f"Error creating FHIR patient bundle: {str(e)}", exc_info=True)
+            raise
+
+    async def create_observations_bundle(self, lab_results: List[LabResult]) -> List[Dict[str, Any]]:
+        """Create multiple observations in a single FHIR transaction Bundle."""
+        try:
+            bundle = {
+                "resourceType": "Bundle",
+                "type": "transaction",
+                "entry": [
+                    {
+                        "resource": self._lab_result_to_fhir(lab_result),
+                        "request": {"method": "POST", "url": "Observation"},
+                    }
+                    for lab_result in lab_results
+                ],
+            }
+
+            response = await self._client.post(
+                "",
+                content=orjson.dumps(bundle),
+                headers={"Content-Type": "application/fhir+json"},
+            )
+            response.raise_for_status()
+
+            result = orjson.loads(response.content)
+            return [entry.get("response", {}) for entry in result.get("entry", [])]
+
+        except Exception as e:
+            logger.error(f"Error creating FHIR observation bundle: {str(e)}", exc_info=True)
+            raise
+
     async def get_observations(
         self, patient_id: str, params: Optional[Dict[str, Any]] = None
     ) -> List[LabResult]:
@@ -111,116 +268,86 @@ class FHIRAPIService(IFHIRService):
             if params:
                 search_params.update(params)
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/Observation",
-                    params=search_params,
-                    headers={"Accept": "application/fhir+json"},
-                )
-                response.raise_for_status()
+            response = await self._client.get("/Observation", params=search_params)
+            response.raise_for_status()
 
-                bundle = response.json()
-                lab_results = []
+            bundle = orjson.loads(response.content)
+            lab_results = []
 
-                if bundle.get("resourceType") == "Bundle" and bundle.get("entry"):
-                    for entry in bundle["entry"]:
-                        if entry.get("resource"):
-                            lab_results.append(self._fhir_to_lab_result(entry["resource"]))
+            if bundle.get("resourceType") == "Bundle" and bundle.get("entry"):
+                for entry in bundle["entry"]:
+                    if entry.get("resource"):
+                        lab_results.append(self._fhir_to_lab_result(entry["resource"]))
 
-                return lab_results
+            return lab_results
 
         except Exception as e:
             logger.error(f"Error getting FHIR observations: {str(e)}", exc_info=True)
             return []
 
-    def _patient_to_fhir(self, patient: Patient) -> Dict[str, Any]:
-        """Convert Patient entity to FHIR Patient resource."""
-        fhir_patient = {
-            "resourceType": "Patient",
-            "identifier": [
-                {
-                    "system": "urn:oid:2.16.840.1.113883.19.5",
-                    "value": patient.mrn or "",
-                }
-            ],
-            "name": [
-                {
-                    "use": "official",
-                    "family": patient.last_name or "",
-                    "given": [patient.first_name or ""],
-                }
-            ],
-        }
-
-        if patient.middle_name:
-            fhir_patient["name"][0]["given"].append(patient.middle_name)
-
-        if patient.gender:
-            fhir_patient["gender"] = patient.gender.lower()
-
-        if patient.date_of_birth:
-            fhir_patient["birthDate"] = patient.date_of_birth.strftime("%Y-%m-%d")
-
-        if patient.phone:
-            fhir_patient["telecom"] = [
-                {"system": "phone", "value": patient.phone, "use": "home"}
-            ]
-
-        if patient.email:
-            if "telecom" not in fhir_patient:
-                fhir_patient["telecom"] = []
-            fhir_patient["telecom"].append(
-                {"system": "email", "value": patient.email}
-            )
-
-        if patient.address:
-            fhir_patient["address"] = [
-                {
-                    "use": "home",
-                    "line": [patient.address],
-                    "city": patient.city or "",
-                    "state": patient.state or "",
-                    "postalCode": patient.zip_code or "",
-                }
-            ]
-
-        return fhir_patient
+    async def get_observations_many(
+        self, patient_ids: List[str]
+    ) -> Dict[str, List[LabResult]]:
+        """
+        Retrieve observations for multiple patients concurrently.
+
+        The shared HTTP/2 client multiplexes the requests over one
+        connection, so wall time is roughly one round-trip instead of one
+        per patient.
+        """
+        results = await asyncio.gather(
+            *(self.get_observations(patient_id) for patient_id in patient_ids)
+        )
+        return dict(zip(patient_ids, results))
+
+    # Convert Patient entity to FHIR Patient resource (compiled at import,
+    # see _compile_patient_to_fhir)
+    _patient_to_fhir = staticmethod(_patient_to_fhir_compiled)
 
     def _fhir_to_patient(self, fhir_data: Dict[str, Any]) -> Patient:
         """Convert FHIR Patient resource to Patient entity."""
         patient = Patient()
 
-        if fhir_data.get("id"):
-            patient.patient_id = fhir_data["id"]
+        patient.patient_id = fhir_data.get("id")
 
-        if fhir_data.get("identifier"):
-            patient.mrn = fhir_data["identifier"][0].get("value")
+        identifiers = fhir_data.get("identifier")
+        if identifiers:
+            patient.mrn = identifiers[0].get("value")
 
-        if fhir_data.get("name") and len(fhir_data["name"]) > 0:
-            name = fhir_data["name"][0]
+        names = fhir_data.get("name")
+        if names:
+            name = names[0]
             patient.last_name = name.get("family")
-            if name.get("given") and len(name["given"]) > 0:
-                patient.first_name = name["given"][0]
-                if len(name["given"]) > 1:
-                    patient.middle_name = name["given"][1]
-
-        if fhir_data.get("gender"):
-            patient.gender = fhir_data["gender"].upper()[0]
-
-        if fhir_data.get("birthDate"):
-            patient.date_of_birth = datetime.strptime(fhir_data["birthDate"], "%Y-%m-%d")
-
-        if fhir_data.get("telecom"):
-            for telecom in fhir_data["telecom"]:
-                if telecom.get("system") == "phone":
-                    patient.phone = telecom.get("value")
-                elif telecom.get("system") == "email":
-                    patient.email = telecom.get("value")
-
-        if fhir_data.get("address") and len(fhir_data["address"]) > 0:
-            address = fhir_data["address"][0]
-            if address.get("line"):
-                patient.address = address["line"][0]
+            given = name.get("given") or ()
+            if given:
+                patient.first_name = given[0]
+                if len(given) > 1:
+                    patient.middle_name = given[1]
+
+        gender = fhir_data.get("gender")
+        if gender:
+            patient.gender = gender.upper()[0]
+
+        birth_date = fhir_data.get("birthDate")
+        if birth_date:
+            # FHIR birthDate is always YYYY-MM-DD; fromisoformat is the
+            # C-implemented fast path versus the strptime format interpreter
+            patient.date_of_birth = datetime.fromisoformat(birth_date)
+
+        # Last entry per system wins, matching the original loop behavior
+        telecom = {
+            t.get("system"): t.get("value")
+            for t in fhir_data.get("telecom") or ()
+        }
+        patient.phone = telecom.get("phone")
+        patient.email = telecom.get("email")
+
+        addresses = fhir_data.get("address")
+        if addresses:
+            address = addresses[0]
+            lines = address.get("line")
+            if lines:
+                patient.address = lines[0]
             patient.city = address.get("city")
             patient.state = address.get("state")
             patient.zip_code = address.get("postalCode")
@@ -229,26 +356,22 @@ class FHIRAPIService(IFHIRService):
 
     def _lab_result_to_fhir(self, lab_result: LabResult) -> Dict[str, Any]:
         """Convert LabResult entity to FHIR Observation resource."""
-        observation = {
-            "resourceType": "Observation",
-            "status": lab_result.status or "final",
-            "code": {
-                "coding": [
-                    {
-                        "system": "http://loinc.org",
-                        "code": lab_result.test_code or "",
-                        "display": lab_result.test_name or "",
-                    }
-                ]
-            },
-            "subject": {
-                "reference": f"Patient/{lab_result.patient_id}"
-            },
+        observation = orjson.loads(_observation_template(
+            lab_result.test_code or "",
+            lab_result.test_name or "",
+            lab_result.status or "final",
+        ))
+        observation["subject"] = {
+            "reference": f"Patient/{lab_result.patient_id}"
         }
 
         if lab_result.result_value:
+            try:
+                value = float(lab_result.result_value)
+            except (TypeError, ValueError):
+                value = None
             observation["valueQuantity"] = {
-                "value": float(lab_result.result_value) if lab_result.result_value.replace('.', '').isdigit() else None,
+                "value": value,
                 "unit": lab_result.unit or "",
             }
 
@@ -266,30 +389,31 @@ class FHIRAPIService(IFHIRService):
         """Convert FHIR Observation resource to LabResult entity."""
         lab_result = LabResult()
 
-        if fhir_data.get("id"):
-            lab_result.observation_id = fhir_data["id"]
+        lab_result.observation_id = fhir_data.get("id")
 
-        if fhir_data.get("subject") and fhir_data["subject"].get("reference"):
-            ref = fhir_data["subject"]["reference"]
-            lab_result.patient_id = ref.split("/")[-1]
+        ref = (fhir_data.get("subject") or {}).get("reference")
+        if ref:
+            lab_result.patient_id = ref.rpartition("/")[2]
 
-        if fhir_data.get("code"):
-            coding = fhir_data["code"].get("coding", [{}])[0]
-            lab_result.test_code = coding.get("code")
-            lab_result.test_name = coding.get("display")
+        coding = (fhir_data.get("code") or {}).get("coding")
+        if coding:
+            lab_result.test_code = coding[0].get("code")
+            lab_result.test_name = coding[0].get("display")
 
-        if fhir_data.get("valueQuantity"):
-            value_qty = fhir_data["valueQuantity"]
+        value_qty = fhir_data.get("valueQuantity")
+        if value_qty:
             lab_result.result_value = str(value_qty.get("value", ""))
             lab_result.unit = value_qty.get("unit", "")
 
-        if fhir_data.get("effectiveDateTime"):
-            lab_result.observed_datetime = datetime.fromisoformat(
-                fhir_data["effectiveDateTime"].replace("Z", "+00:00")
-            )
+        dt_str = fhir_data.get("effectiveDateTime")
+        if dt_str:
+            if dt_str.endswith("Z"):
+                dt_str = dt_str[:-1] + "+00:00"
+            lab_result.observed_datetime = datetime.fromisoformat(dt_str)
 
-        if fhir_data.get("referenceRange"):
-            lab_result.reference_range = fhir_data["referenceRange"][0].get("text")
+        reference_range = fhir_data.get("referenceRange")
+        if reference_range:
+            lab_result.reference_range = reference_range[0].get("text")
 
         lab_result.status = fhir_data.get("status", "final")
 
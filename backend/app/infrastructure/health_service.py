@@ -1,12 +1,16 @@
 """Health check service for Mirth Connect connectivity (URS IR-1)."""
 import asyncio
+import random
 import socket
 from datetime import datetime
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
+
+import httpx
 from loguru import logger
 
 from app.config import settings
+from app.infrastructure import dns_cache
 
 
 @dataclass
@@ -30,6 +34,62 @@ class HealthCheckService:
     def __init__(self):
         self.mllp_start = b'\x0b'
         self.mllp_end = b'\x1c\x0d'
+        # Last healthy OpenEMR result as (monotonic timestamp, result);
+        # served within the TTL so polled /health calls don't hammer the
+        # FHIR metadata endpoint
+        self._openemr_cache: Optional[tuple] = None
+        self._openemr_ttl = 10.0
+        # Shared HTTP client created lazily on first use so keep-alive
+        # connections are reused across health checks
+        self._http: Optional[httpx.AsyncClient] = None
+        # Latest results from the background refresh task, so HTTP
+        # callers never wait out the connect timeouts inline
+        self._latest: Optional[Dict[str, HealthCheckResult]] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=5.0,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Stop the background refresh and release the shared HTTP client."""
+        await self.stop_background()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def start_background(self, interval: float = 5.0) -> None:
+        """Start refreshing all health checks on a fixed interval."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop(interval))
+
+    async def stop_background(self) -> None:
+        """Cancel the background refresh task if it is running."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            try:
+                self._latest = await self.check_all_systems()
+            except Exception as e:
+                logger.error(f"Background health refresh failed: {str(e)}", exc_info=True)
+            await asyncio.sleep(interval)
+
+    def get_cached(self) -> Optional[Dict[str, HealthCheckResult]]:
+        """Return the most recent background results, if any."""
+        return self._latest
 
     async def check_mirth_connectivity(self) -> HealthCheckResult:
         """
@@ -41,25 +101,34 @@ class HealthCheckService:
         Returns:
             HealthCheckResult with connectivity status
         """
-        start_time = datetime.utcnow()
+        # Single monotonic timestamp instead of a datetime.utcnow() pair
+        # per branch; loop.time() is a cheap float with no allocation
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
 
         try:
-            # Attempt to connect to Mirth MLLP endpoint
+            # Attempt to connect to Mirth MLLP endpoint via the cached
+            # resolved address
+            address = await dns_cache.resolve(settings.MLLP_HOST, settings.MLLP_PORT)
             reader, writer = await asyncio.wait_for(
                 asyncio.open_connection(
-                    settings.MLLP_HOST,
+                    address,
                     settings.MLLP_PORT
                 ),
                 timeout=5.0  # 5 second timeout for connection
             )
 
             try:
+                sock = writer.get_extra_info('socket')
+                if sock is not None:
+                    # Disable Nagle so the probe frame goes out immediately
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
                 # Create a minimal test message (not sent, just connection test)
                 test_msg = "MSH|^~\\&|TEST|TEST|TEST|TEST|20250101000000||ACK|TEST|P|2.5"
-                mllp_message = self.mllp_start + test_msg.encode('utf-8') + self.mllp_end
 
                 # Send test message
-                writer.write(mllp_message)
+                writer.writelines((self.mllp_start, test_msg.encode('utf-8'), self.mllp_end))
                 await writer.drain()
 
                 # Try to read response with short timeout
@@ -70,8 +139,7 @@ class HealthCheckService:
                     has_response = False
 
                 # Calculate response time
-                end_time = datetime.utcnow()
-                response_time_ms = (end_time - start_time).total_seconds() * 1000
+                response_time_ms = (loop.time() - t0) * 1000
 
                 # Connection successful
                 return HealthCheckResult(
@@ -88,12 +156,13 @@ class HealthCheckService:
                 )
 
             finally:
+                # Fire-and-forget close: a liveness probe has no data in
+                # flight worth waiting a FIN round-trip for
                 writer.close()
-                await writer.wait_closed()
 
         except asyncio.TimeoutError:
-            end_time = datetime.utcnow()
-            response_time_ms = (end_time - start_time).total_seconds() * 1000
+            response_time_ms = (loop.time() - t0) * 1000
+            dns_cache.invalidate(settings.MLLP_HOST, settings.MLLP_PORT)
 
             return HealthCheckResult(
                 service="mirth_connect",
@@ -109,8 +178,8 @@ class HealthCheckService:
             )
 
         except ConnectionRefusedError:
-            end_time = datetime.utcnow()
-            response_time_ms = (end_time - start_time).total_seconds() * 1000
+            response_time_ms = (loop.time() - t0) * 1000
+            dns_cache.invalidate(settings.MLLP_HOST, settings.MLLP_PORT)
 
             return HealthCheckResult(
                 service="mirth_connect",
@@ -126,8 +195,7 @@ class HealthCheckService:
             )
 
         except socket.gaierror as e:
-            end_time = datetime.utcnow()
-            response_time_ms = (end_time - start_time).total_seconds() * 1000
+            response_time_ms = (loop.time() - t0) * 1000
 
             return HealthCheckResult(
                 service="mirth_connect",
@@ -143,8 +211,7 @@ class HealthCheckService:
             )
 
         except Exception as e:
-            end_time = datetime.utcnow()
-            response_time_ms = (end_time - start_time).total_seconds() * 1000
+            response_time_ms = (loop.time() - t0) * 1000
 
             logger.error(f"Error checking Mirth connectivity: {str(e)}", exc_info=True)
 
@@ -168,48 +235,55 @@ class HealthCheckService:
         Returns:
             HealthCheckResult with connectivity status
         """
-        start_time = datetime.utcnow()
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+
+        # Serve the cached healthy result while it is fresh; the jitter
+        # staggers refreshes when several pollers line up on the TTL edge
+        if self._openemr_cache is not None:
+            cached_at, cached_result = self._openemr_cache
+            if t0 - cached_at < self._openemr_ttl + random.uniform(0, 2):
+                return cached_result
 
         try:
-            import httpx
-
-            # Check if FHIR endpoint is reachable
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                # Try metadata endpoint
-                response = await client.get(
-                    f"{settings.FHIR_BASE_URL}/metadata",
-                    headers={"Accept": "application/fhir+json"}
-                )
+            # Check if FHIR endpoint is reachable via the shared client
+            response = await self._client().get(
+                f"{settings.FHIR_BASE_URL}/metadata",
+                headers={"Accept": "application/fhir+json"}
+            )
+
+            response_time_ms = (loop.time() - t0) * 1000
 
-                end_time = datetime.utcnow()
-                response_time_ms = (end_time - start_time).total_seconds() * 1000
-
-                if response.status_code == 200:
-                    return HealthCheckResult(
-                        service="openemr_fhir",
-                        status="healthy",
-                        message=f"Successfully connected to OpenEMR FHIR API",
-                        response_time_ms=response_time_ms,
-                        details={
-                            "base_url": settings.FHIR_BASE_URL,
-                            "status_code": response.status_code,
-                        }
-                    )
-                else:
-                    return HealthCheckResult(
-                        service="openemr_fhir",
-                        status="degraded",
-                        message=f"OpenEMR FHIR API responded with status {response.status_code}",
-                        response_time_ms=response_time_ms,
-                        details={
-                            "base_url": settings.FHIR_BASE_URL,
-                            "status_code": response.status_code,
-                        }
-                    )
+            if response.status_code == 200:
+                result = HealthCheckResult(
+                    service="openemr_fhir",
+                    status="healthy",
+                    message=f"Successfully connected to OpenEMR FHIR API",
+                    response_time_ms=response_time_ms,
+                    details={
+                        "base_url": settings.FHIR_BASE_URL,
+                        "status_code": response.status_code,
+                    }
+                )
+                # Only healthy results are cached; degraded and
+                # unhealthy states are always re-checked
+                self._openemr_cache = (loop.time(), result)
+                return result
+            else:
+                return HealthCheckResult(
+                    service="openemr_fhir",
+                    status="degraded",
+                    message=f"OpenEMR FHIR API responded with status {response.status_code}",
+                    response_time_ms=response_time_ms,
+                    details={
+                        "base_url": settings.FHIR_BASE_URL,
+                        "status_code": response.status_code,
+                    }
+                )
 
         except Exception as e:
-            end_time = datetime.utcnow()
-            response_time_ms = (end_time - start_time).total_seconds() * 1000
+            response_time_ms = (loop.time() - t0) * 1000
+            self._openemr_cache = None
 
             logger.error(f"Error checking OpenEMR connectivity: {str(e)}", exc_info=True)
 
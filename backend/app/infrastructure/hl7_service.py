@@ -1,64 +1,148 @@
 """HL7 v2 Service implementation."""
 import socket
 import asyncio
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any
-from hl7apy.core import Message, Segment
+from typing import Dict, Any, List, Optional, Tuple
 from hl7apy.parser import parse_message
 from loguru import logger
 
 from app.config import settings
 from app.domain.entities import Patient, LabResult, HL7Message, MessageType
+from app.infrastructure import dns_cache
 from app.domain.interfaces import IHL7Service
 
 
+def _segment(segment_id: str, fields: Dict[int, str]) -> str:
+    """Render an ER7 segment from sparse field assignments.
+
+    Outbound messages use a fixed, small set of fields per segment, so
+    emitting the pipe-delimited text directly skips hl7apy's per-field
+    schema lookups and validation, which dominate message build time.
+    """
+    parts = [segment_id] + [""] * max(fields)
+    for index, value in fields.items():
+        parts[index] = value
+    return "|".join(parts)
+
+
+class MLLPConnectionPool:
+    """
+    Small keep-alive pool of MLLP connections keyed by (host, port).
+
+    Opening a TCP connection per HL7 message costs a handshake round-trip
+    and leaves sockets in TIME_WAIT; reusing connections amortizes that
+    across bursts of ADT/ORU traffic. Connections idle longer than the
+    TTL, or that the peer has half-closed, are dropped instead of reused.
+    """
+
+    def __init__(self, idle_ttl: float = 30.0, max_idle: int = 4):
+        self._idle: Dict[Tuple[str, int], deque] = {}
+        self._idle_ttl = idle_ttl
+        self._max_idle = max_idle
+
+    async def acquire(self, host: str, port: int) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Return a pooled connection if one is still usable, else open one."""
+        idle = self._idle.get((host, port))
+        if idle:
+            now = asyncio.get_running_loop().time()
+            while idle:
+                reader, writer, returned_at = idle.pop()
+                if (
+                    now - returned_at > self._idle_ttl
+                    or reader.at_eof()
+                    or writer.is_closing()
+                ):
+                    writer.close()
+                    continue
+                return reader, writer
+        # Connect to the cached resolved address; on failure drop the
+        # cache entry so the next attempt re-resolves
+        address = await dns_cache.resolve(host, port)
+        try:
+            reader, writer = await asyncio.open_connection(address, port)
+        except OSError:
+            dns_cache.invalidate(host, port)
+            raise
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            # Disable Nagle so small MLLP frames and ACKs are not delayed
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Keepalive lets the kernel flag dead peers on idle pooled
+            # connections instead of surfacing them as send failures
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return reader, writer
+
+    def release(self, host: str, port: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Return a healthy connection to the pool for reuse."""
+        if reader.at_eof() or writer.is_closing():
+            writer.close()
+            return
+        idle = self._idle.setdefault((host, port), deque())
+        idle.append((reader, writer, asyncio.get_running_loop().time()))
+        while len(idle) > self._max_idle:
+            _, old_writer, _ = idle.popleft()
+            old_writer.close()
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        for idle in self._idle.values():
+            while idle:
+                _, writer, _ = idle.pop()
+                writer.close()
+        self._idle.clear()
+
+
 class HL7v2Service(IHL7Service):
     """HL7 v2 messaging service implementation."""
 
-    def __init__(self):
+    def __init__(self, pool: Optional[MLLPConnectionPool] = None):
         self.facility = "INTERFACE_WIZARD"
         self.application = "IW"
         self.mllp_start = b'\x0b'
         self.mllp_end = b'\x1c\x0d'
+        self._pool = pool or MLLPConnectionPool()
+
+    async def aclose(self) -> None:
+        """Release pooled MLLP connections."""
+        await self._pool.aclose()
+
+    def _msh(self, message_type: str, control_id: str, ts: str) -> str:
+        """Render the MSH segment for an outbound message."""
+        return (
+            f"MSH|^~\\&|{self.application}|{self.facility}|OpenEMR|OpenEMR"
+            f"|{ts}||{message_type}|{control_id}|P|2.5"
+        )
 
     async def create_patient_message(self, patient: Patient) -> HL7Message:
         """Create an HL7 ADT^A04 message for registering a patient (as per URS v2.0)."""
         try:
-            # Create HL7 message - ADT^A04 is for patient registration
-            msg = Message("ADT_A01")  # Use ADT_A01 structure for A04
-            msg.msh.msh_3 = self.application
-            msg.msh.msh_4 = self.facility
-            msg.msh.msh_5 = "OpenEMR"
-            msg.msh.msh_6 = "OpenEMR"
-            msg.msh.msh_7 = datetime.now().strftime("%Y%m%d%H%M%S")
-            msg.msh.msh_9 = "ADT^A04^ADT_A01"  # A04 = Register Patient
-            msg.msh.msh_10 = patient.mrn or str(datetime.now().timestamp())
-            msg.msh.msh_11 = "P"  # Production
-            msg.msh.msh_12 = "2.5"
-
-            # EVN segment
-            msg.add_segment("EVN")
-            msg.evn.evn_1 = "A04"  # Event type code for registration
-            msg.evn.evn_2 = datetime.now().strftime("%Y%m%d%H%M%S")
-
-            # PID segment
-            msg.add_segment("PID")
-            msg.pid.pid_1 = "1"
-            msg.pid.pid_3 = patient.mrn or f"MRN{datetime.now().timestamp()}"
-
-            # Patient name
+            # A04 = Register Patient, carried in the ADT_A01 structure.
+            # One datetime.now() per message; every timestamp field
+            # derives from it
+            now = datetime.now()
+            ts = now.strftime("%Y%m%d%H%M%S")
+            control_id = patient.mrn or str(now.timestamp())
+
+            pid_fields = {
+                1: "1",
+                3: patient.mrn or f"MRN{now.timestamp()}",
+            }
+
+            # Patient name, built once whatever the component count
             if patient.last_name and patient.first_name:
-                msg.pid.pid_5 = f"{patient.last_name}^{patient.first_name}"
+                name_parts = [patient.last_name, patient.first_name]
                 if patient.middle_name:
-                    msg.pid.pid_5 = f"{patient.last_name}^{patient.first_name}^{patient.middle_name}"
+                    name_parts.append(patient.middle_name)
+                pid_fields[5] = "^".join(name_parts)
 
             # Date of birth
             if patient.date_of_birth:
-                msg.pid.pid_7 = patient.date_of_birth.strftime("%Y%m%d")
+                pid_fields[7] = patient.date_of_birth.strftime("%Y%m%d")
 
             # Gender
             if patient.gender:
-                msg.pid.pid_8 = patient.gender[0].upper()  # M or F
+                pid_fields[8] = patient.gender[0].upper()  # M or F
 
             # Address
             if patient.address:
@@ -69,17 +153,21 @@ class HL7v2Service(IHL7Service):
                     patient.state or "",
                     patient.zip_code or "",
                 ]
-                msg.pid.pid_11 = "^".join(address_parts)
+                pid_fields[11] = "^".join(address_parts)
 
             # Phone
             if patient.phone:
-                msg.pid.pid_13 = patient.phone
+                pid_fields[13] = patient.phone
 
             # SSN
             if patient.ssn:
-                msg.pid.pid_19 = patient.ssn
+                pid_fields[19] = patient.ssn
 
-            message_content = msg.to_er7()
+            message_content = "\r".join((
+                self._msh("ADT^A04^ADT_A01", control_id, ts),
+                _segment("EVN", {1: "A04", 2: ts}),
+                _segment("PID", pid_fields),
+            ))
 
             return HL7Message(
                 message_type=MessageType.ADT_A04,  # Fixed: Using ADT_A04 for patient registration (URS v2.0)
@@ -93,41 +181,31 @@ class HL7v2Service(IHL7Service):
     async def create_lab_result_message(self, lab_result: LabResult) -> HL7Message:
         """Create an HL7 ORU^R01 message for lab results."""
         try:
-            msg = Message("ORU_R01")
-            msg.msh.msh_3 = self.application
-            msg.msh.msh_4 = self.facility
-            msg.msh.msh_5 = "OpenEMR"
-            msg.msh.msh_6 = "OpenEMR"
-            msg.msh.msh_7 = datetime.now().strftime("%Y%m%d%H%M%S")
-            msg.msh.msh_9 = "ORU^R01^ORU_R01"
-            msg.msh.msh_10 = lab_result.observation_id or str(datetime.now().timestamp())
-            msg.msh.msh_11 = "P"
-            msg.msh.msh_12 = "2.5"
-
-            # PID segment
-            msg.add_segment("PID")
-            msg.pid.pid_1 = "1"
-            msg.pid.pid_3 = lab_result.patient_id
+            now = datetime.now()
+            ts = now.strftime("%Y%m%d%H%M%S")
+            control_id = lab_result.observation_id or str(now.timestamp())
+            test_id = lab_result.test_code or lab_result.test_name
 
             # OBR segment (Observation Request)
-            msg.add_segment("OBR")
-            msg.obr.obr_1 = "1"
-            msg.obr.obr_4 = lab_result.test_code or lab_result.test_name
-
+            obr_fields = {1: "1", 4: test_id}
             if lab_result.observed_datetime:
-                msg.obr.obr_7 = lab_result.observed_datetime.strftime("%Y%m%d%H%M%S")
-
-            # OBX segment (Observation Result)
-            msg.add_segment("OBX")
-            msg.obx.obx_1 = "1"
-            msg.obx.obx_2 = "NM"  # Numeric
-            msg.obx.obx_3 = lab_result.test_code or lab_result.test_name
-            msg.obx.obx_5 = lab_result.result_value
-            msg.obx.obx_6 = lab_result.unit or ""
-            msg.obx.obx_7 = lab_result.reference_range or ""
-            msg.obx.obx_11 = lab_result.status or "F"  # Final
-
-            message_content = msg.to_er7()
+                obr_fields[7] = lab_result.observed_datetime.strftime("%Y%m%d%H%M%S")
+
+            message_content = "\r".join((
+                self._msh("ORU^R01^ORU_R01", control_id, ts),
+                _segment("PID", {1: "1", 3: lab_result.patient_id}),
+                _segment("OBR", obr_fields),
+                # OBX segment (Observation Result), numeric value type
+                _segment("OBX", {
+                    1: "1",
+                    2: "NM",
+                    3: test_id,
+                    5: lab_result.result_value,
+                    6: lab_result.unit or "",
+                    7: lab_result.reference_range or "",
+                    11: lab_result.status or "F",  # Final
+                }),
+            ))
 
             return HL7Message(
                 message_type=MessageType.ORU_R01,
@@ -141,37 +219,25 @@ class HL7v2Service(IHL7Service):
     async def create_admit_message(self, patient: Patient, admission_data: Dict[str, Any]) -> HL7Message:
         """Create an HL7 ADT^A01 message for patient admission."""
         try:
-            msg = Message("ADT_A01")
-            msg.msh.msh_3 = self.application
-            msg.msh.msh_4 = self.facility
-            msg.msh.msh_5 = "OpenEMR"
-            msg.msh.msh_6 = "OpenEMR"
-            msg.msh.msh_7 = datetime.now().strftime("%Y%m%d%H%M%S")
-            msg.msh.msh_9 = "ADT^A01^ADT_A01"
-            msg.msh.msh_10 = str(datetime.now().timestamp())
-            msg.msh.msh_11 = "P"
-            msg.msh.msh_12 = "2.5"
-
-            # EVN segment
-            msg.add_segment("EVN")
-            msg.evn.evn_1 = "A01"
-            admission_dt = admission_data.get("admission_datetime", datetime.now())
-            msg.evn.evn_2 = admission_dt.strftime("%Y%m%d%H%M%S")
-
-            # PID segment
-            msg.add_segment("PID")
-            msg.pid.pid_1 = "1"
-            msg.pid.pid_3 = patient.patient_id or patient.mrn
-
-            # PV1 segment (Patient Visit)
-            msg.add_segment("PV1")
-            msg.pv1.pv1_1 = "1"
-            msg.pv1.pv1_2 = "I"  # Inpatient
-            msg.pv1.pv1_3 = admission_data.get("location", "General Ward")
-            msg.pv1.pv1_7 = admission_data.get("attending_doctor", "")
-            msg.pv1.pv1_44 = admission_dt.strftime("%Y%m%d%H%M%S")
-
-            message_content = msg.to_er7()
+            now = datetime.now()
+            ts = now.strftime("%Y%m%d%H%M%S")
+            control_id = str(now.timestamp())
+            admission_dt = admission_data.get("admission_datetime", now)
+            admission_ts = admission_dt.strftime("%Y%m%d%H%M%S")
+
+            message_content = "\r".join((
+                self._msh("ADT^A01^ADT_A01", control_id, ts),
+                _segment("EVN", {1: "A01", 2: admission_ts}),
+                _segment("PID", {1: "1", 3: patient.patient_id or patient.mrn}),
+                # PV1 segment (Patient Visit), inpatient
+                _segment("PV1", {
+                    1: "1",
+                    2: "I",
+                    3: admission_data.get("location", "General Ward"),
+                    7: admission_data.get("attending_doctor", ""),
+                    44: admission_ts,
+                }),
+            ))
 
             return HL7Message(
                 message_type=MessageType.ADT_A01,
@@ -185,36 +251,24 @@ class HL7v2Service(IHL7Service):
     async def create_discharge_message(self, patient: Patient, discharge_data: Dict[str, Any]) -> HL7Message:
         """Create an HL7 ADT^A03 message for patient discharge."""
         try:
-            msg = Message("ADT_A03")
-            msg.msh.msh_3 = self.application
-            msg.msh.msh_4 = self.facility
-            msg.msh.msh_5 = "OpenEMR"
-            msg.msh.msh_6 = "OpenEMR"
-            msg.msh.msh_7 = datetime.now().strftime("%Y%m%d%H%M%S")
-            msg.msh.msh_9 = "ADT^A03^ADT_A03"
-            msg.msh.msh_10 = str(datetime.now().timestamp())
-            msg.msh.msh_11 = "P"
-            msg.msh.msh_12 = "2.5"
-
-            # EVN segment
-            msg.add_segment("EVN")
-            msg.evn.evn_1 = "A03"
-            discharge_dt = discharge_data.get("discharge_datetime", datetime.now())
-            msg.evn.evn_2 = discharge_dt.strftime("%Y%m%d%H%M%S")
-
-            # PID segment
-            msg.add_segment("PID")
-            msg.pid.pid_1 = "1"
-            msg.pid.pid_3 = patient.patient_id or patient.mrn
-
-            # PV1 segment
-            msg.add_segment("PV1")
-            msg.pv1.pv1_1 = "1"
-            msg.pv1.pv1_2 = "I"
-            msg.pv1.pv1_36 = discharge_data.get("discharge_disposition", "")
-            msg.pv1.pv1_45 = discharge_dt.strftime("%Y%m%d%H%M%S")
-
-            message_content = msg.to_er7()
+            now = datetime.now()
+            ts = now.strftime("%Y%m%d%H%M%S")
+            control_id = str(now.timestamp())
+            discharge_dt = discharge_data.get("discharge_datetime", now)
+            discharge_ts = discharge_dt.strftime("%Y%m%d%H%M%S")
+
+            message_content = "\r".join((
+                self._msh("ADT^A03^ADT_A03", control_id, ts),
+                _segment("EVN", {1: "A03", 2: discharge_ts}),
+                _segment("PID", {1: "1", 3: patient.patient_id or patient.mrn}),
+                # PV1 segment, inpatient discharge
+                _segment("PV1", {
+                    1: "1",
+                    2: "I",
+                    36: discharge_data.get("discharge_disposition", ""),
+                    45: discharge_ts,
+                }),
+            ))
 
             return HL7Message(
                 message_type=MessageType.ADT_A03,
@@ -228,30 +282,34 @@ class HL7v2Service(IHL7Service):
     async def send_message(self, message: HL7Message) -> HL7Message:
         """Send HL7 message via MLLP and wait for ACK."""
         try:
-            # Wrap message with MLLP markers
-            mllp_message = self.mllp_start + message.message_content.encode('utf-8') + self.mllp_end
-
-            # Send via TCP socket
-            reader, writer = await asyncio.open_connection(
+            # Send via a pooled TCP connection
+            reader, writer = await self._pool.acquire(
                 settings.MLLP_HOST,
                 settings.MLLP_PORT
             )
 
             try:
-                # Send message
-                writer.write(mllp_message)
+                # Frame with MLLP markers via scatter-gather, avoiding a
+                # concatenated copy of the payload
+                writer.writelines((
+                    self.mllp_start,
+                    message.message_content.encode('utf-8'),
+                    self.mllp_end,
+                ))
                 await writer.drain()
                 message.sent_at = datetime.utcnow()
 
-                # Wait for ACK with timeout
-                ack_data = await asyncio.wait_for(
-                    reader.read(4096),
+                # Read one complete MLLP frame, exactly like the batch
+                # path: a bare read() can return a fragmented ACK and
+                # leave its tail buffered on the pooled socket, where the
+                # next caller would parse it as its own reply
+                frame = await asyncio.wait_for(
+                    reader.readuntil(self.mllp_end),
                     timeout=settings.MLLP_TIMEOUT
                 )
-
-                # Parse ACK
-                ack_content = ack_data.decode('utf-8').strip(self.mllp_start.decode() + self.mllp_end.decode())
-                ack_info = await self.parse_ack(ack_content)
+                ack_bytes = frame.removeprefix(self.mllp_start).removesuffix(self.mllp_end)
+                ack_content = ack_bytes.decode('utf-8', 'replace')
+                ack_info = self.parse_ack(ack_content)
 
                 message.ack_received_at = datetime.utcnow()
                 message.ack_status = ack_info.get("status")
@@ -259,9 +317,12 @@ class HL7v2Service(IHL7Service):
 
                 logger.info(f"Message sent and ACK received: {message.ack_status}")
 
-            finally:
+            except BaseException:
+                # Connection state is unknown after a failure; never reuse it
                 writer.close()
-                await writer.wait_closed()
+                raise
+            else:
+                self._pool.release(settings.MLLP_HOST, settings.MLLP_PORT, reader, writer)
 
             return message
 
@@ -277,8 +338,157 @@ class HL7v2Service(IHL7Service):
             message.ack_message = str(e)
             return message
 
-    async def parse_ack(self, ack_content: str) -> Dict[str, Any]:
+    async def send_messages(self, messages: List[HL7Message]) -> List[HL7Message]:
+        """
+        Send several HL7 messages over one MLLP connection, pipelined.
+
+        All frames are written back-to-back before the ACKs are read in
+        order, so a bulk batch costs one connection plus the per-ACK
+        waits instead of a connection setup per message.
+        """
+        if not messages:
+            return []
+
+        try:
+            reader, writer = await self._pool.acquire(
+                settings.MLLP_HOST,
+                settings.MLLP_PORT
+            )
+        except Exception as e:
+            logger.error(f"Error connecting for batch send: {str(e)}", exc_info=True)
+            for message in messages:
+                message.ack_status = "ERROR"
+                message.ack_message = str(e)
+            return messages
+
+        try:
+            buffers = []
+            sent_at = datetime.utcnow()
+            for message in messages:
+                buffers.extend((
+                    self.mllp_start,
+                    message.message_content.encode('utf-8'),
+                    self.mllp_end,
+                ))
+                message.sent_at = sent_at
+            writer.writelines(buffers)
+            await writer.drain()
+
+            for message in messages:
+                frame = await asyncio.wait_for(
+                    reader.readuntil(self.mllp_end),
+                    timeout=settings.MLLP_TIMEOUT
+                )
+                ack_bytes = frame.removeprefix(self.mllp_start).removesuffix(self.mllp_end)
+                ack_info = await self._parse_ack_async(ack_bytes.decode('utf-8', 'replace'))
+                message.ack_received_at = datetime.utcnow()
+                message.ack_status = ack_info.get("status")
+                message.ack_message = ack_info.get("message")
+
+            logger.info(f"Batch of {len(messages)} messages sent over one MLLP session")
+
+        except asyncio.TimeoutError:
+            logger.error("Timeout waiting for ACK in batch send")
+            writer.close()
+            for message in messages:
+                if message.ack_received_at is None:
+                    message.ack_status = "TIMEOUT"
+                    message.ack_message = "No ACK received within timeout period"
+            return messages
+
+        except Exception as e:
+            logger.error(f"Error in batch send: {str(e)}", exc_info=True)
+            writer.close()
+            for message in messages:
+                if message.ack_received_at is None:
+                    message.ack_status = "ERROR"
+                    message.ack_message = str(e)
+            return messages
+
+        else:
+            self._pool.release(settings.MLLP_HOST, settings.MLLP_PORT, reader, writer)
+
+        return messages
+
+    def parse_ack(self, ack_content: str) -> Dict[str, Any]:
         """Parse ACK message and extract status with ERR segment details (URS FR-4, IR-2)."""
+        try:
+            result = self._parse_ack_fast(ack_content)
+            if result is not None:
+                return result
+        except Exception as e:
+            logger.warning(f"Fast ACK parse failed, falling back to hl7apy: {str(e)}")
+        return self._parse_ack_hl7apy(ack_content)
+
+    async def _parse_ack_async(self, ack_content: str) -> Dict[str, Any]:
+        """
+        Parse an ACK without blocking the event loop on the fallback.
+
+        The fast string extractor runs inline; only when it cannot handle
+        the content does the hl7apy parse (schema load plus full message
+        tree) move to a worker thread, so concurrent sends keep reading
+        ACKs while an odd message is being dissected.
+        """
+        try:
+            result = self._parse_ack_fast(ack_content)
+            if result is not None:
+                return result
+        except Exception as e:
+            logger.warning(f"Fast ACK parse failed, falling back to hl7apy: {str(e)}")
+        return await asyncio.to_thread(self._parse_ack_hl7apy, ack_content)
+
+    @staticmethod
+    def _parse_ack_fast(ack_content: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract MSA/ERR fields by splitting the raw ER7 text.
+
+        An ACK is a handful of pipe-delimited segments; plain string
+        splitting reads MSA-1/MSA-3 and the ERR fields in microseconds,
+        versus the full message tree hl7apy builds. Returns None when no
+        MSA segment is found so the caller can fall back to hl7apy.
+        """
+        msa_fields = None
+        error_details = []
+        error_codes = []
+        error_locations = []
+
+        for segment in ack_content.split('\r'):
+            segment = segment.strip()
+            if segment.startswith('MSA'):
+                msa_fields = segment.split('|')
+            elif segment.startswith('ERR'):
+                fields = segment.split('|')
+                # ERR-2: error location, ERR-3: HL7 error code,
+                # ERR-7: diagnostic information, ERR-8: user message
+                if len(fields) > 2 and fields[2]:
+                    error_locations.append(fields[2])
+                if len(fields) > 3 and fields[3]:
+                    error_codes.append(fields[3])
+                if len(fields) > 7 and fields[7]:
+                    error_details.append(fields[7])
+                if len(fields) > 8 and fields[8]:
+                    error_details.append(fields[8])
+
+        if msa_fields is None:
+            return None
+
+        result = {
+            "status": msa_fields[1] if len(msa_fields) > 1 and msa_fields[1] else "AR",
+            "message": msa_fields[3] if len(msa_fields) > 3 else "",
+            "full_ack": ack_content,
+        }
+
+        if error_details or error_codes or error_locations:
+            result["error_details"] = {
+                "codes": error_codes,
+                "messages": error_details,
+                "locations": error_locations,
+            }
+
+        return result
+
+    def _parse_ack_hl7apy(self, ack_content: str) -> Dict[str, Any]:
+        """Fallback ACK parse via hl7apy for messages the fast path rejects."""
         try:
             ack_msg = parse_message(ack_content)
 
@@ -1,6 +1,10 @@
 """NLP Service implementation using OpenAI."""
+import hashlib
 import json
-from typing import Optional
+from collections import OrderedDict
+from typing import AsyncIterator, Optional
+
+import httpx
 from openai import AsyncOpenAI
 from loguru import logger
 
@@ -9,25 +13,129 @@ from app.domain.entities import UserCommand, CommandType, OperationResult, Conve
 from app.domain.interfaces import INLPService
 
 
+# Static prompts hoisted to module level so each OpenAI call reuses the
+# same string objects instead of rebuilding multi-KB literals
+_INTERPRETATION_SYSTEM_PROMPT = """You are an AI assistant for Interface Wizard, a healthcare data integration tool.
+Your task is to interpret natural language commands related to EHR data operations and convert them into structured format.
+
+Available command types:
+- create_patient: Create a single patient record
+- create_bulk: Create multiple patient records at once
+- update_patient: Update an existing patient record
+- retrieve_patient: Retrieve patient information
+- retrieve_lab_result: Retrieve lab results for a patient
+- admit_patient: Admit a patient to the hospital
+- discharge_patient: Discharge a patient from the hospital
+- transfer_patient: Transfer a patient to another location
+- query: General query about data
+- unknown: Command cannot be understood
+
+Extract parameters from the command such as:
+- count: number of records (for bulk operations)
+- patient_id, mrn: patient identifiers
+- first_name, last_name, date_of_birth, gender: patient demographics
+- test_type: type of lab test
+- location: hospital location
+- Any other relevant parameters mentioned
+
+Respond ONLY with a JSON object in this format:
+{
+    "command_type": "create_patient",
+    "parameters": {
+        "first_name": "John",
+        "last_name": "Doe",
+        ...
+    },
+    "confidence": 0.95
+}"""
+
+def _truncated_json(data, limit: int = 500) -> str:
+    """Serialize roughly the first `limit` characters of data.
+
+    Bulk results can carry thousands of records; sampling a small prefix
+    before serializing keeps prompt building bounded instead of dumping
+    the whole payload and slicing most of it away.
+    """
+    if isinstance(data, list):
+        sample = data[:5]
+    elif isinstance(data, dict):
+        sample = {
+            key: value[:5] if isinstance(value, list) else value
+            for key, value in list(data.items())[:10]
+        }
+    else:
+        sample = data
+    return json.dumps(sample, indent=2, default=str)[:limit]
+
+
+_RESPONSE_GENERATION_SYSTEM_PROMPT = """You are a friendly AI assistant for Interface Wizard.
+Generate clear, concise, and helpful responses to users about their EHR data operations.
+
+Guidelines:
+- Be professional but conversational
+- Explain what was done clearly
+- If there were errors, explain them in simple terms and suggest solutions
+- Use medical terminology appropriately but keep language accessible
+- Keep responses concise (2-4 sentences typically)
+- If data was retrieved, present it in a readable format"""
+
+
+# One client for the whole process: keep-alive connections and HTTP/2
+# multiplexing to the OpenAI API survive service re-instantiation, so
+# cold requests skip the TCP+TLS handshake
+_client = AsyncOpenAI(
+    api_key=settings.OPENAI_API_KEY,
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=100),
+    ),
+)
+
+
 class OpenAINLPService(INLPService):
     """NLP service implementation using OpenAI GPT-4."""
 
+    # Bounded LRU of successful interpretations; repeated phrases like
+    # "create 10 patients" skip the OpenAI round-trip entirely
+    _CACHE_MAX = 1024
+
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = _client
         self.model = settings.OPENAI_MODEL
+        self._interpretation_cache: OrderedDict = OrderedDict()
+        # Prebuilt system messages reused across every request
+        self._interpretation_system_message = {
+            "role": "system",
+            "content": _INTERPRETATION_SYSTEM_PROMPT,
+        }
+        self._response_system_message = {
+            "role": "system",
+            "content": _RESPONSE_GENERATION_SYSTEM_PROMPT,
+        }
 
     async def interpret_command(
         self, raw_text: str, context: Optional[ConversationContext] = None
     ) -> UserCommand:
         """Interpret natural language command using OpenAI."""
+        cache_key = self._interpretation_cache_key(raw_text, context)
+        cached = self._interpretation_cache.get(cache_key)
+        if cached is not None:
+            self._interpretation_cache.move_to_end(cache_key)
+            command_type, parameters = cached
+            # Fresh UserCommand per hit so command_id/timestamp stay unique
+            return UserCommand(
+                raw_text=raw_text,
+                command_type=command_type,
+                parameters=dict(parameters),
+            )
+
         try:
-            system_prompt = self._get_interpretation_system_prompt()
             user_prompt = self._build_interpretation_user_prompt(raw_text, context)
 
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    self._interpretation_system_message,
                     {"role": "user", "content": user_prompt},
                 ],
                 temperature=settings.OPENAI_TEMPERATURE,
@@ -38,10 +146,20 @@ class OpenAINLPService(INLPService):
             result = json.loads(response.choices[0].message.content)
             logger.info(f"NLP interpretation result: {result}")
 
+            command_type = CommandType(result.get("command_type", "unknown"))
+            parameters = result.get("parameters", {})
+
+            # Only cache understood commands so a transient failure or an
+            # unparseable phrase doesn't poison future lookups
+            if command_type != CommandType.UNKNOWN:
+                self._interpretation_cache[cache_key] = (command_type, parameters)
+                if len(self._interpretation_cache) > self._CACHE_MAX:
+                    self._interpretation_cache.popitem(last=False)
+
             return UserCommand(
                 raw_text=raw_text,
-                command_type=CommandType(result.get("command_type", "unknown")),
-                parameters=result.get("parameters", {}),
+                command_type=command_type,
+                parameters=dict(parameters),
             )
 
         except Exception as e:
@@ -57,13 +175,12 @@ class OpenAINLPService(INLPService):
     ) -> str:
         """Generate human-friendly response using OpenAI."""
         try:
-            system_prompt = self._get_response_generation_system_prompt()
             user_prompt = self._build_response_generation_user_prompt(operation_result, context)
 
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    self._response_system_message,
                     {"role": "user", "content": user_prompt},
                 ],
                 temperature=0.7,
@@ -76,41 +193,51 @@ class OpenAINLPService(INLPService):
             logger.error(f"Error generating response: {str(e)}", exc_info=True)
             return operation_result.message  # Fallback to default message
 
-    def _get_interpretation_system_prompt(self) -> str:
-        """Get system prompt for command interpretation."""
-        return """You are an AI assistant for Interface Wizard, a healthcare data integration tool.
-Your task is to interpret natural language commands related to EHR data operations and convert them into structured format.
+    async def generate_response_stream(
+        self, operation_result: OperationResult, context: Optional[ConversationContext] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the human-friendly response token by token.
 
-Available command types:
-- create_patient: Create a single patient record
-- create_bulk: Create multiple patient records at once
-- update_patient: Update an existing patient record
-- retrieve_patient: Retrieve patient information
-- retrieve_lab_result: Retrieve lab results for a patient
-- admit_patient: Admit a patient to the hospital
-- discharge_patient: Discharge a patient from the hospital
-- transfer_patient: Transfer a patient to another location
-- query: General query about data
-- unknown: Command cannot be understood
+        Yields content deltas as OpenAI produces them, so callers can
+        surface the first words after roughly the time-to-first-token
+        instead of waiting for the full completion.
+        """
+        try:
+            user_prompt = self._build_response_generation_user_prompt(operation_result, context)
 
-Extract parameters from the command such as:
-- count: number of records (for bulk operations)
-- patient_id, mrn: patient identifiers
-- first_name, last_name, date_of_birth, gender: patient demographics
-- test_type: type of lab test
-- location: hospital location
-- Any other relevant parameters mentioned
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    self._response_system_message,
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=0.7,
+                max_tokens=500,
+                stream=True,
+            )
 
-Respond ONLY with a JSON object in this format:
-{
-    "command_type": "create_patient",
-    "parameters": {
-        "first_name": "John",
-        "last_name": "Doe",
-        ...
-    },
-    "confidence": 0.95
-}"""
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}", exc_info=True)
+            yield operation_result.message  # Fallback to default message
+
+    @staticmethod
+    def _interpretation_cache_key(raw_text: str, context: Optional[ConversationContext]) -> tuple:
+        """Cache key over the utterance plus a fingerprint of the context."""
+        digest = hashlib.blake2b(raw_text.encode(), digest_size=16).hexdigest()
+        last_command_id = ""
+        if context and context.command_history:
+            last_command_id = context.command_history[-1].command_id
+        return (digest, last_command_id)
+
+    def _get_interpretation_system_prompt(self) -> str:
+        """Get system prompt for command interpretation."""
+        return _INTERPRETATION_SYSTEM_PROMPT
 
     def _build_interpretation_user_prompt(self, raw_text: str, context: Optional[ConversationContext]) -> str:
         """Build user prompt for command interpretation."""
@@ -126,16 +253,7 @@ Respond ONLY with a JSON object in this format:
 
     def _get_response_generation_system_prompt(self) -> str:
         """Get system prompt for response generation."""
-        return """You are a friendly AI assistant for Interface Wizard.
-Generate clear, concise, and helpful responses to users about their EHR data operations.
-
-Guidelines:
-- Be professional but conversational
-- Explain what was done clearly
-- If there were errors, explain them in simple terms and suggest solutions
-- Use medical terminology appropriately but keep language accessible
-- Keep responses concise (2-4 sentences typically)
-- If data was retrieved, present it in a readable format"""
+        return _RESPONSE_GENERATION_SYSTEM_PROMPT
 
     def _build_response_generation_user_prompt(
         self, operation_result: OperationResult, context: Optional[ConversationContext]
@@ -153,7 +271,7 @@ Protocol Used: {operation_result.protocol_used.value if operation_result.protoco
 """
 
         if operation_result.data:
-            prompt += f"Data: {json.dumps(operation_result.data, indent=2)[:500]}\n\n"
+            prompt += f"Data: {_truncated_json(operation_result.data)}\n\n"
 
         if operation_result.errors:
             prompt += f"Errors: {', '.join(operation_result.errors[:3])}\n\n"
@@ -1,5 +1,8 @@
 """Repository implementations for data persistence."""
-from typing import Optional, List, Dict
+import asyncio
+import bisect
+import time
+from typing import AsyncIterator, Optional, List, Dict, Tuple
 from datetime import datetime
 
 from app.domain.entities import HL7Message, OperationResult, ConversationContext
@@ -11,18 +14,22 @@ class InMemoryMessageRepository(IMessageRepository):
 
     def __init__(self):
         self.messages: Dict[str, HL7Message] = {}
-        self.sessions: Dict[str, List[str]] = {}
+        # Insertion-ordered sets of message ids per session: dict keys give
+        # O(1) insert-if-new, so re-saving a message cannot append duplicates
+        self.sessions: Dict[str, Dict[str, None]] = {}
+        # Serializes the two-step save so concurrent writers can't
+        # interleave between the message write and the session index update
+        self._lock = asyncio.Lock()
 
     async def save_message(self, message: HL7Message) -> None:
         """Save an HL7 message."""
-        self.messages[message.message_id] = message
+        async with self._lock:
+            self.messages[message.message_id] = message
 
-        # Track by session if metadata contains session_id
-        session_id = message.metadata.get("session_id")
-        if session_id:
-            if session_id not in self.sessions:
-                self.sessions[session_id] = []
-            self.sessions[session_id].append(message.message_id)
+            # Track by session if metadata contains session_id
+            session_id = message.metadata.get("session_id")
+            if session_id:
+                self.sessions.setdefault(session_id, {})[message.message_id] = None
 
     async def get_message(self, message_id: str) -> Optional[HL7Message]:
         """Retrieve a message by ID."""
@@ -30,8 +37,18 @@ class InMemoryMessageRepository(IMessageRepository):
 
     async def get_messages_by_session(self, session_id: str) -> List[HL7Message]:
         """Retrieve all messages for a session."""
-        message_ids = self.sessions.get(session_id, [])
-        return [self.messages[mid] for mid in message_ids if mid in self.messages]
+        return [m async for m in self.iter_messages_by_session(session_id)]
+
+    async def iter_messages_by_session(self, session_id: str) -> AsyncIterator[HL7Message]:
+        """Stream a session's messages without materializing the list.
+
+        Iterate-once consumers of large sessions stay at O(1) memory;
+        get_messages_by_session remains for callers that need the list.
+        """
+        for message_id in self.sessions.get(session_id, ()):
+            message = self.messages.get(message_id)
+            if message is not None:
+                yield message
 
 
 class InMemoryOperationRepository(IOperationRepository):
@@ -39,22 +56,41 @@ class InMemoryOperationRepository(IOperationRepository):
 
     def __init__(self):
         self.operations: Dict[str, OperationResult] = {}
-        self.sessions: Dict[str, List[str]] = {}
+        # (command_id, operation_id) pairs kept sorted so session queries
+        # bisect straight to the matching prefix range instead of scanning
+        # every stored operation
+        self._command_index: List[Tuple[str, str]] = []
+        # Guards the check-then-insort sequence against concurrent saves
+        self._lock = asyncio.Lock()
 
     async def save_operation(self, operation: OperationResult) -> None:
         """Save an operation result."""
-        self.operations[operation.operation_id] = operation
+        async with self._lock:
+            if operation.operation_id not in self.operations:
+                bisect.insort(self._command_index, (operation.command_id, operation.operation_id))
+            self.operations[operation.operation_id] = operation
 
     async def get_operation(self, operation_id: str) -> Optional[OperationResult]:
         """Retrieve an operation by ID."""
         return self.operations.get(operation_id)
 
     async def get_operations_by_session(self, session_id: str) -> List[OperationResult]:
-        """Retrieve all operations for a session."""
-        return [
-            op for op in self.operations.values()
-            if op.command_id.startswith(session_id)
-        ]
+        """Retrieve all operations for a session.
+
+        Prefix matches form a contiguous range of the sorted command-id
+        index, so a bisect plus a bounded walk answers the query in
+        O(log N + k); a character trie would only add per-node dict hops
+        for the same asymptotics.
+        """
+        start = bisect.bisect_left(self._command_index, (session_id,))
+        results = []
+        for command_id, operation_id in self._command_index[start:]:
+            if not command_id.startswith(session_id):
+                break
+            operation = self.operations.get(operation_id)
+            if operation is not None:
+                results.append(operation)
+        return results
 
 
 class InMemoryContextRepository(IContextRepository):
@@ -62,10 +98,16 @@ class InMemoryContextRepository(IContextRepository):
 
     def __init__(self):
         self.contexts: Dict[str, ConversationContext] = {}
+        self._lock = asyncio.Lock()
+        # (monotonic stamp, datetime) reused for ~100ms so rapid context
+        # touches share one utcnow() call; last_activity needs no finer
+        # resolution than that
+        self._ts_cache: Tuple[float, datetime] = (0.0, datetime.utcnow())
 
     async def save_context(self, context: ConversationContext) -> None:
         """Save conversation context."""
-        self.contexts[context.session_id] = context
+        async with self._lock:
+            self.contexts[context.session_id] = context
 
     async def get_context(self, session_id: str) -> Optional[ConversationContext]:
         """Retrieve conversation context by session ID."""
@@ -73,5 +115,15 @@ class InMemoryContextRepository(IContextRepository):
 
     async def update_context(self, context: ConversationContext) -> None:
         """Update existing conversation context."""
-        context.last_activity = datetime.utcnow()
-        self.contexts[context.session_id] = context
+        now_mono = time.monotonic()
+        cached_at, cached_ts = self._ts_cache
+        if now_mono - cached_at >= 0.1:
+            cached_ts = datetime.utcnow()
+            self._ts_cache = (now_mono, cached_ts)
+        context.last_activity = cached_ts
+
+        # Contexts are mutated in place, so the common case is re-storing
+        # the object already registered under this session id
+        if self.contexts.get(context.session_id) is not context:
+            async with self._lock:
+                self.contexts[context.session_id] = context
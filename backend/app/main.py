@@ -1,13 +1,28 @@
 """Main FastAPI application."""
+import asyncio
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from loguru import logger
 
 from app.config import settings
+from app.presentation.dependencies import (
+    close_services,
+    get_context_repository,
+    get_csv_service,
+    get_data_generator,
+    get_fhir_service,
+    get_health_service,
+    get_hl7_service,
+    get_message_repository,
+    get_nlp_service,
+    get_operation_repository,
+    get_process_command_use_case,
+)
 from app.presentation.routes import router
 
 # Configure logging
@@ -24,6 +39,41 @@ logger.add(
     level=settings.LOG_LEVEL,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Eagerly build the singletons at boot and tear them down on exit."""
+    logger.info("Starting {} v{}", settings.APP_NAME, settings.APP_VERSION)
+    logger.info("Environment: {}", settings.ENVIRONMENT)
+    logger.info("Debug mode: {}", settings.DEBUG)
+    logger.info("CORS Origins: {}", settings.cors_origins_list)
+
+    # Construct every singleton now so the first user request doesn't
+    # pay service construction on top of its own work, and stash the
+    # hot-path ones on app.state so handlers skip the dependency solver
+    get_nlp_service()
+    get_hl7_service()
+    get_fhir_service()
+    get_data_generator()
+    get_message_repository()
+    app.state.use_case = get_process_command_use_case()
+    app.state.csv_service = get_csv_service()
+    app.state.context_repo = get_context_repository()
+    app.state.operation_repo = get_operation_repository()
+    app.state.health_service = get_health_service()
+    # At most a handful of bulk ingests run concurrently, so one huge
+    # CSV upload can't monopolize the worker and starve /health
+    app.state.bulk_semaphore = asyncio.Semaphore(4)
+    # Refresh health checks in the background so /health/detailed serves
+    # cached results instead of paying connect timeouts inline
+    app.state.health_service.start_background()
+
+    yield
+
+    await close_services()
+    logger.info("Shutting down {}", settings.APP_NAME)
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -31,33 +81,61 @@ app = FastAPI(
     description="Generative AI-based healthcare data integration tool for HL7/FHIR interfaces",
     docs_url="/docs",
     redoc_url="/redoc",
+    # orjson serializes responses in native code and handles datetimes
+    # directly, so hot endpoints skip the stdlib json.dumps pass
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+# Refuse oversized bodies from the declared Content-Length before
+# Starlette ever parses the multipart form; once a handler with
+# Form/File parameters is entered the body has already been read, so
+# this check only works ahead of routing
+class UploadSizeLimitMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        """Reject requests whose declared body exceeds the upload cap."""
+        content_length = request.headers.get('content-length')
+        if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_BYTES:
+            return ORJSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"detail": "File too large"},
+            )
+        return await call_next(request)
+
+
 # Define logging middleware class
 class LoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         """Log all incoming requests for debugging."""
-        print(f"🔴 MIDDLEWARE CALLED: {request.method} {request.url.path}")
-        logger.info(f"📥 {request.method} {request.url.path}")
-        logger.info(f"   Headers: {dict(request.headers)}")
-        logger.info(f"   Query params: {dict(request.query_params)}")
+        # headers.raw is Starlette's existing list of (bytes, bytes)
+        # tuples; logging it avoids decoding every header into a fresh
+        # dict just to print it
+        if settings.DEBUG:
+            logger.debug("📥 {} {}", request.method, request.url.path)
+            logger.debug("   Headers: {}", request.headers.raw)
+            logger.debug("   Query params: {}", request.query_params)
 
         try:
             response = await call_next(request)
-            print(f"📤 Response status: {response.status_code}")
-            logger.info(f"📤 Response status: {response.status_code}")
-            return response
         except Exception as e:
-            logger.error(f"❌ Request failed: {str(e)}", exc_info=True)
-            print(f"❌ Request failed: {str(e)}")
-            return JSONResponse(
+            # opt(exception=True) defers traceback formatting to the sink
+            logger.opt(exception=True).error("❌ Request failed: {}", e)
+            return ORJSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"detail": f"Internal server error: {str(e)}"}
             )
 
+        logger.info("📥 {} {} -> {}", request.method, request.url.path, response.status_code)
+        return response
+
 # Add logging middleware FIRST
 app.add_middleware(LoggingMiddleware)
 
+# Registered after LoggingMiddleware (so it wraps it) but before CORS:
+# oversized uploads are refused before logging and the router run, while
+# CORS stays outermost so the 413 still carries CORS headers
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Configure CORS - AFTER logging
 app.add_middleware(
     CORSMiddleware,
@@ -71,21 +149,6 @@ app.add_middleware(
 app.include_router(router, prefix="/api/v1", tags=["Interface Wizard"])
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Startup event handler."""
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
-    logger.info(f"CORS Origins: {settings.cors_origins_list}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Shutdown event handler."""
-    logger.info(f"Shutting down {settings.APP_NAME}")
-
-
 @app.get("/")
 async def root():
     """Root endpoint."""
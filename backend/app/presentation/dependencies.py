@@ -15,88 +15,73 @@ from app.infrastructure.repositories import (
 from app.infrastructure.health_service import HealthCheckService
 
 
-# Singleton instances
-_nlp_service = None
-_hl7_service = None
-_fhir_service = None
-_data_generator = None
-_csv_service = None
-_message_repo = None
-_operation_repo = None
-_context_repo = None
-_health_service = None
-
-
+# Each getter is a process-wide singleton; lru_cache implements the
+# create-once check in C and is safe under FastAPI's sync threadpool,
+# unlike the previous global-plus-None-check pattern
+@lru_cache(maxsize=1)
 def get_nlp_service() -> OpenAINLPService:
     """Get NLP service instance."""
-    global _nlp_service
-    if _nlp_service is None:
-        _nlp_service = OpenAINLPService()
-    return _nlp_service
+    return OpenAINLPService()
 
 
+@lru_cache(maxsize=1)
 def get_hl7_service() -> HL7v2Service:
     """Get HL7 service instance."""
-    global _hl7_service
-    if _hl7_service is None:
-        _hl7_service = HL7v2Service()
-    return _hl7_service
+    return HL7v2Service()
 
 
+@lru_cache(maxsize=1)
 def get_fhir_service() -> FHIRAPIService:
     """Get FHIR service instance."""
-    global _fhir_service
-    if _fhir_service is None:
-        _fhir_service = FHIRAPIService()
-    return _fhir_service
+    return FHIRAPIService()
 
 
+@lru_cache(maxsize=1)
 def get_data_generator() -> FakerDataGenerator:
     """Get data generator instance."""
-    global _data_generator
-    if _data_generator is None:
-        _data_generator = FakerDataGenerator()
-    return _data_generator
+    return FakerDataGenerator()
 
 
+@lru_cache(maxsize=1)
 def get_csv_service() -> CSVProcessingService:
     """Get CSV processing service instance."""
-    global _csv_service
-    if _csv_service is None:
-        _csv_service = CSVProcessingService()
-    return _csv_service
+    return CSVProcessingService()
 
 
+@lru_cache(maxsize=1)
 def get_message_repository() -> InMemoryMessageRepository:
     """Get message repository instance."""
-    global _message_repo
-    if _message_repo is None:
-        _message_repo = InMemoryMessageRepository()
-    return _message_repo
+    return InMemoryMessageRepository()
 
 
+@lru_cache(maxsize=1)
 def get_operation_repository() -> InMemoryOperationRepository:
     """Get operation repository instance."""
-    global _operation_repo
-    if _operation_repo is None:
-        _operation_repo = InMemoryOperationRepository()
-    return _operation_repo
+    return InMemoryOperationRepository()
 
 
+@lru_cache(maxsize=1)
 def get_context_repository() -> InMemoryContextRepository:
     """Get context repository instance."""
-    global _context_repo
-    if _context_repo is None:
-        _context_repo = InMemoryContextRepository()
-    return _context_repo
+    return InMemoryContextRepository()
 
 
+@lru_cache(maxsize=1)
 def get_health_service() -> HealthCheckService:
     """Get health check service instance."""
-    global _health_service
-    if _health_service is None:
-        _health_service = HealthCheckService()
-    return _health_service
+    return HealthCheckService()
+
+
+async def close_services() -> None:
+    """Release service resources on app shutdown."""
+    # cache_info().currsize tells us whether a service was ever built,
+    # so shutdown doesn't instantiate one just to close it
+    if get_fhir_service.cache_info().currsize:
+        await get_fhir_service().aclose()
+    if get_hl7_service.cache_info().currsize:
+        await get_hl7_service().aclose()
+    if get_health_service.cache_info().currsize:
+        await get_health_service().aclose()
 
 
 def get_process_command_use_case() -> ProcessCommandUseCase:
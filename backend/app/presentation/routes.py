@@ -1,18 +1,18 @@
 """API routes for Interface Wizard."""
+import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from typing import Optional, Tuple
+from fastapi import APIRouter, HTTPException, Request, status, UploadFile, File, Form
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
 
 from app.config import settings
 from app.application.use_cases import ProcessCommandUseCase
-from app.presentation.dependencies import (
-    get_process_command_use_case,
-    get_context_repository,
-    get_operation_repository,
-    get_csv_service,
-    get_health_service,
-)
 from app.presentation.schemas import (
     CommandRequest,
     OperationResponse,
@@ -29,24 +29,90 @@ from app.presentation.schemas import (
 
 router = APIRouter()
 
+# Pre-rendered /health response reused for up to a second; load balancer
+# probes hit this endpoint several times a second per pod and don't need
+# a fresh pydantic round-trip each time
+_health_cached: Optional[Tuple[float, ORJSONResponse]] = None
+
+# Upload parsers keyed by file extension: one dict lookup replaces the
+# chained string compares in both upload handlers
+_STREAM_PARSERS = {
+    'csv': lambda svc, f: svc.parse_csv_stream(f),
+    'xlsx': lambda svc, f: svc.parse_excel_stream(f, 'xlsx'),
+    'xls': lambda svc, f: svc.parse_excel_stream(f, 'xls'),
+    'pdf': lambda svc, f: svc.parse_pdf_stream(f),
+}
+
+
+# Rendered payloads for completed operations, which never change once
+# finished; LRU-bounded so repeated polling of /operation/{id} costs one
+# dict hit instead of a model build per call
+_OP_RESPONSE_CACHE_MAX = 2048
+_op_response_cache: OrderedDict = OrderedDict()
+
+
+# Rejection details for bad uploads, formatted once per extension seen
+# rather than on every failing request; invalid-upload floods during
+# load tests otherwise spend their time rebuilding identical strings
+_UNSUPPORTED_TYPE_DETAIL = "Unsupported file type: .{ext}. Supported types: CSV, Excel (.xlsx, .xls), PDF"
+_INVALID_FILE_DETAIL = "Invalid {ext} file: {error}"
+
+
+@lru_cache(maxsize=32)
+def _unsupported_type_detail(ext: str) -> str:
+    return _UNSUPPORTED_TYPE_DETAIL.format(ext=ext)
+
+
+def _raise_bad_upload(ext: str, error: Optional[str] = None) -> None:
+    """Raise the 400 for a rejected upload from one place.
+
+    With no error the extension is unsupported; with one, parsing the
+    file failed. Centralizing the raisers keeps the three upload
+    handlers' rejection wording identical.
+    """
+    if error is None:
+        detail = _unsupported_type_detail(ext)
+    else:
+        detail = _INVALID_FILE_DETAIL.format(ext=ext.upper(), error=error)
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _to_operation_response(result) -> ORJSONResponse:
+    """Render an OperationResult as a serialized OperationResponse.
+
+    Shared by every endpoint that returns an operation, so the mapping
+    (including the enum-to-string handling in the model's validator)
+    lives in exactly one place.
+    """
+    return ORJSONResponse(OperationResponse.model_validate(result).model_dump())
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
-    return HealthResponse(
-        status="healthy",
-        version=settings.APP_VERSION,
-        timestamp=datetime.utcnow(),
+    global _health_cached
+    now = time.monotonic()
+    if _health_cached is not None and now - _health_cached[0] < 1.0:
+        return _health_cached[1]
+
+    response = ORJSONResponse(
+        content={
+            "status": "healthy",
+            "version": settings.APP_VERSION,
+            "timestamp": datetime.utcnow(),
+        },
+        headers={"Cache-Control": "max-age=1"},
     )
+    _health_cached = (now, response)
+    return response
 
 
 @router.post("/command", response_model=OperationResponse)
 async def process_command(
+    request: Request,
     command: Optional[str] = Form(None),
     session_id: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
-    use_case: ProcessCommandUseCase = Depends(get_process_command_use_case),
-    csv_service = Depends(get_csv_service),
 ):
     """
     Process a natural language command with optional CSV file upload.
@@ -57,14 +123,26 @@ async def process_command(
 
     If a CSV file is provided, it will be processed and patients will be created from the CSV data.
     """
-    # Log incoming request details for debugging
-    logger.info("=" * 80)
-    logger.info("INCOMING REQUEST to /command endpoint")
-    logger.info(f"  Command: {command!r}")
-    logger.info(f"  Session ID: {session_id!r}")
-    logger.info(f"  File: {file.filename if file else None}")
-    logger.info(f"  Content Type: {file.content_type if file else None}")
-    logger.info("=" * 80)
+    # Singletons come off app.state (set during lifespan) rather than
+    # Depends, skipping FastAPI's dependency solver on the hot path
+    use_case: ProcessCommandUseCase = request.app.state.use_case
+    csv_service = request.app.state.csv_service
+
+    # Read the UploadFile properties once; each access goes through a
+    # descriptor on Starlette's wrapper
+    has_file = bool(file and file.filename)
+    filename = file.filename if has_file else None
+
+    # Banner-style per-request logging is debug-only; the single info
+    # line below covers production tracing
+    if settings.DEBUG:
+        logger.debug(
+            "Command request: {!r} (session: {!r}, file: {}, content_type: {})",
+            command,
+            session_id,
+            filename,
+            file.content_type if has_file else None,
+        )
 
     try:
         # Ensure command has a value, even if not provided
@@ -72,86 +150,129 @@ async def process_command(
             command = ""
             logger.warning("Command is empty, using empty string")
 
-        logger.info(f"Processing command: {command} (session: {session_id}, file: {file.filename if file else None})")
+        logger.info("Processing command: {} (session: {}, file: {})", command, session_id, filename)
 
         # Handle file upload (CSV, Excel, PDF)
         csv_patients = None
-        if file and file.filename:
-            file_ext = file.filename.lower().split('.')[-1]
-            logger.info(f"Processing {file_ext.upper()} file: {file.filename}")
+        if has_file:
+            file_ext = os.path.splitext(filename)[1][1:].lower()
+            logger.info("Processing {} file: {}", file_ext.upper(), filename)
+
+            parser = _STREAM_PARSERS.get(file_ext)
+            if parser is None:
+                _raise_bad_upload(file_ext)
 
             try:
-                # Read file content
-                file_content = await file.read()
-
-                # Parse based on file type
-                if file_ext == 'csv':
-                    csv_patients = csv_service.parse_csv(file_content)
-                elif file_ext in ['xlsx', 'xls']:
-                    csv_patients = csv_service.parse_excel(file_content, file_ext)
-                elif file_ext == 'pdf':
-                    csv_patients = csv_service.parse_pdf(file_content)
-                else:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Unsupported file type: .{file_ext}. Supported types: CSV, Excel (.xlsx, .xls), PDF",
-                    )
-
-                logger.info(f"Parsed {len(csv_patients)} patients from {file_ext.upper()} file")
+                # Parse straight from the upload's spooled file so the
+                # request never buffers the whole payload in memory, and
+                # off the event loop so a large parse can't stall other
+                # requests on this worker
+                csv_patients = await run_in_threadpool(parser, csv_service, file.file)
+
+                logger.info("Parsed {} patients from {} file", len(csv_patients), file_ext.upper())
 
                 # Override command to indicate bulk patient creation
                 if not command.strip():
                     command = f"Create {len(csv_patients)} patients from uploaded {file_ext.upper()} file"
 
             except ValueError as ve:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid {file_ext.upper()} file: {str(ve)}",
-                )
+                _raise_bad_upload(file_ext, str(ve))
             except Exception as e:
-                logger.error(f"Error processing {file_ext.upper()} file: {str(e)}", exc_info=True)
+                logger.opt(exception=True).error("Error processing {} file: {}", file_ext.upper(), e)
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=f"Failed to process {file_ext.upper()} file: {str(e)}",
                 )
 
-        result = await use_case.execute(
-            raw_command=command,
-            session_id=session_id,
-            csv_patients=csv_patients,
-        )
+        if csv_patients is not None:
+            # Bulk ingests share a small semaphore so concurrent large
+            # uploads queue instead of saturating the event loop together
+            async with request.app.state.bulk_semaphore:
+                result = await use_case.execute(
+                    raw_command=command,
+                    session_id=session_id,
+                    csv_patients=csv_patients,
+                )
+        else:
+            result = await use_case.execute(
+                raw_command=command,
+                session_id=session_id,
+                csv_patients=csv_patients,
+            )
 
-        return OperationResponse(
-            operation_id=result.operation_id,
-            status=result.status.value,
-            message=result.message,
-            data=result.data,
-            errors=result.errors,
-            warnings=result.warnings,
-            protocol_used=result.protocol_used.value if result.protocol_used else None,
-            records_affected=result.records_affected,
-            records_succeeded=result.records_succeeded,
-            records_failed=result.records_failed,
-            created_at=result.created_at,
-            completed_at=result.completed_at,
-        )
+        return _to_operation_response(result)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing command: {str(e)}", exc_info=True)
+        logger.opt(exception=True).error("Error processing command: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while processing your command: {str(e)}",
         )
 
 
+@router.post("/command/stream")
+async def process_command_stream(
+    request: Request,
+    command: Optional[str] = Form(None),
+    session_id: Optional[str] = Form(None),
+    file: Optional[UploadFile] = File(None),
+):
+    """
+    Process a command, streaming progress as newline-delimited JSON.
+
+    Bulk uploads yield one JSON row per patient as it completes plus a
+    final summary row, so clients can show live progress instead of
+    waiting for the whole batch to finish.
+    """
+    use_case: ProcessCommandUseCase = request.app.state.use_case
+    csv_service = request.app.state.csv_service
+
+    has_file = bool(file and file.filename)
+    filename = file.filename if has_file else None
+
+    if not command:
+        command = ""
+    logger.info("Streaming command: {} (session: {}, file: {})", command, session_id, filename)
+
+    csv_patients = None
+    if has_file:
+        file_ext = os.path.splitext(filename)[1][1:].lower()
+
+        parser = _STREAM_PARSERS.get(file_ext)
+        if parser is None:
+            _raise_bad_upload(file_ext)
+
+        try:
+            csv_patients = await run_in_threadpool(parser, csv_service, file.file)
+            if not command.strip():
+                command = f"Create {len(csv_patients)} patients from uploaded {file_ext.upper()} file"
+        except ValueError as ve:
+            _raise_bad_upload(file_ext, str(ve))
+
+    async def _ndjson():
+        # The bulk semaphore is held for the life of the stream, so a
+        # streamed ingest counts against the same concurrency budget as
+        # a buffered one
+        async with request.app.state.bulk_semaphore:
+            async for row in use_case.execute_streaming(
+                raw_command=command,
+                session_id=session_id,
+                csv_patients=csv_patients,
+            ):
+                yield orjson.dumps(row) + b"\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
 @router.get("/session/{session_id}", response_model=SessionResponse)
 async def get_session(
     session_id: str,
-    context_repo = Depends(get_context_repository),
+    request: Request,
 ):
     """Get session information."""
+    context_repo = request.app.state.context_repo
     try:
         context = await context_repo.get_context(session_id)
 
@@ -172,7 +293,7 @@ async def get_session(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting session: {str(e)}", exc_info=True)
+        logger.opt(exception=True).error("Error getting session: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -182,9 +303,15 @@ async def get_session(
 @router.get("/operation/{operation_id}", response_model=OperationResponse)
 async def get_operation(
     operation_id: str,
-    operation_repo = Depends(get_operation_repository),
+    request: Request,
 ):
     """Get operation details by ID."""
+    cached = _op_response_cache.get(operation_id)
+    if cached is not None:
+        _op_response_cache.move_to_end(operation_id)
+        return ORJSONResponse(cached)
+
+    operation_repo = request.app.state.operation_repo
     try:
         operation = await operation_repo.get_operation(operation_id)
 
@@ -194,37 +321,36 @@ async def get_operation(
                 detail=f"Operation {operation_id} not found",
             )
 
-        return OperationResponse(
-            operation_id=operation.operation_id,
-            status=operation.status.value,
-            message=operation.message,
-            data=operation.data,
-            errors=operation.errors,
-            warnings=operation.warnings,
-            protocol_used=operation.protocol_used.value if operation.protocol_used else None,
-            records_affected=operation.records_affected,
-            records_succeeded=operation.records_succeeded,
-            records_failed=operation.records_failed,
-            created_at=operation.created_at,
-            completed_at=operation.completed_at,
-        )
+        payload = OperationResponse.model_validate(operation).model_dump()
+        # Only completed operations are immutable enough to cache
+        if operation.completed_at is not None:
+            _op_response_cache[operation_id] = payload
+            if len(_op_response_cache) > _OP_RESPONSE_CACHE_MAX:
+                _op_response_cache.popitem(last=False)
+        return ORJSONResponse(payload)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting operation: {str(e)}", exc_info=True)
+        logger.opt(exception=True).error("Error getting operation: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         )
 
 
-@router.post("/preview", response_model=ConfirmationPreviewResponse)
+@router.post(
+    "/preview",
+    response_model=ConfirmationPreviewResponse,
+    # Preview records are mostly-None patient fields; dropping the None
+    # entries shrinks both the serialization pass and the wire payload
+    response_model_exclude_none=True,
+)
 async def preview_operation(
+    request: Request,
     command: Optional[str] = Form(None),
     session_id: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
-    csv_service = Depends(get_csv_service),
 ):
     """
     Preview operation before execution (URS FR-3 - Confirmation Dialog).
@@ -232,6 +358,7 @@ async def preview_operation(
     This endpoint allows users to preview what will happen before confirming.
     Returns a preview with sample records and validation warnings.
     """
+    csv_service = request.app.state.csv_service
     try:
         import uuid
 
@@ -241,29 +368,18 @@ async def preview_operation(
         # Handle file upload
         csv_patients = None
         if file and file.filename:
-            file_ext = file.filename.lower().split('.')[-1]
-            logger.info(f"Previewing {file_ext.upper()} file: {file.filename}")
+            file_ext = os.path.splitext(file.filename)[1][1:].lower()
+            logger.info("Previewing {} file: {}", file_ext.upper(), file.filename)
+
+            parser = _STREAM_PARSERS.get(file_ext)
+            if parser is None:
+                _raise_bad_upload(file_ext)
 
             try:
-                file_content = await file.read()
-
-                if file_ext == 'csv':
-                    csv_patients = csv_service.parse_csv(file_content)
-                elif file_ext in ['xlsx', 'xls']:
-                    csv_patients = csv_service.parse_excel(file_content, file_ext)
-                elif file_ext == 'pdf':
-                    csv_patients = csv_service.parse_pdf(file_content)
-                else:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Unsupported file type: .{file_ext}",
-                    )
+                csv_patients = await run_in_threadpool(parser, csv_service, file.file)
 
             except ValueError as ve:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid {file_ext.upper()} file: {str(ve)}",
-                )
+                _raise_bad_upload(file_ext, str(ve))
 
         if not csv_patients:
             raise HTTPException(
@@ -271,10 +387,10 @@ async def preview_operation(
                 detail="No file provided or file is empty",
             )
 
-        # Create preview records (first 5)
-        preview_records = []
-        for patient in csv_patients[:5]:
-            preview_records.append(PatientPreview(
+        # Create preview records (first 5), built in one comprehension
+        # so the list is allocated at its final size
+        preview_records = [
+            PatientPreview(
                 name=f"{patient.first_name or ''} {patient.last_name or ''}".strip(),
                 mrn=patient.mrn,
                 date_of_birth=str(patient.date_of_birth) if patient.date_of_birth else None,
@@ -282,7 +398,9 @@ async def preview_operation(
                 phone=patient.phone,
                 email=patient.email,
                 address=patient.address,
-            ))
+            )
+            for patient in csv_patients[:5]
+        ]
 
         # Calculate estimated time (rough estimate: 0.5 seconds per patient)
         estimated_time = int(len(csv_patients) * 0.5)
@@ -304,7 +422,7 @@ async def preview_operation(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error previewing operation: {str(e)}", exc_info=True)
+        logger.opt(exception=True).error("Error previewing operation: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to preview operation: {str(e)}",
@@ -314,7 +432,6 @@ async def preview_operation(
 @router.post("/confirm", response_model=OperationResponse)
 async def confirm_operation(
     confirmation: ConfirmationRequest,
-    use_case: ProcessCommandUseCase = Depends(get_process_command_use_case),
 ):
     """
     Confirm and execute previewed operation (URS FR-3).
@@ -343,7 +460,7 @@ async def confirm_operation(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error confirming operation: {str(e)}", exc_info=True)
+        logger.opt(exception=True).error("Error confirming operation: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
@@ -352,7 +469,7 @@ async def confirm_operation(
 
 @router.get("/health/detailed", response_model=SystemHealthResponse)
 async def detailed_health_check(
-    health_service = Depends(get_health_service),
+    request: Request,
 ):
     """
     Detailed health check endpoint (URS IR-1 - Real-time Status Indicators).
@@ -363,9 +480,13 @@ async def detailed_health_check(
 
     Returns detailed status for each service.
     """
+    health_service = request.app.state.health_service
     try:
-        # Check all systems
-        results = await health_service.check_all_systems()
+        # Prefer the background-refreshed results; only check inline when
+        # the refresh task has not produced a snapshot yet
+        results = health_service.get_cached()
+        if results is None:
+            results = await health_service.check_all_systems()
 
         # Get overall status
         overall_status = health_service.get_overall_status(results)
@@ -389,7 +510,7 @@ async def detailed_health_check(
         )
 
     except Exception as e:
-        logger.error(f"Error in detailed health check: {str(e)}", exc_info=True)
+        logger.opt(exception=True).error("Error in detailed health check: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Health check failed: {str(e)}",
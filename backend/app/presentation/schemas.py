@@ -1,7 +1,17 @@
 """Pydantic schemas for API request/response validation."""
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.domain.entities import OperationStatus, Protocol
+
+# String forms for the status/protocol enums, built once; a dict hit is
+# cheaper than isinstance plus the .value descriptor on every response
+_ENUM_STR = {
+    member: member.value
+    for enum_cls in (OperationStatus, Protocol)
+    for member in enum_cls
+}
 
 
 class CommandRequest(BaseModel):
@@ -11,7 +21,17 @@ class CommandRequest(BaseModel):
 
 
 class OperationResponse(BaseModel):
-    """Response model for operation results."""
+    """Response model for operation results.
+
+    Built straight from the OperationResult domain object via
+    model_validate, so the field mapping runs in pydantic-core instead
+    of Python-level keyword assembly in every route. Every value
+    arrives from internal objects already carrying the right types, so
+    strict mode skips pydantic's coercion branches, and frozen skips
+    the __setattr__ validation hooks.
+    """
+    model_config = ConfigDict(from_attributes=True, strict=True, frozen=True, extra='ignore')
+
     operation_id: str
     status: str
     message: str
@@ -25,6 +45,12 @@ class OperationResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime] = None
 
+    @field_validator("status", "protocol_used", mode="before")
+    @classmethod
+    def _enum_value(cls, value):
+        """Accept domain enums directly, storing their string value."""
+        return _ENUM_STR.get(value, value)
+
 
 class HealthResponse(BaseModel):
     """Health check response."""
@@ -117,3 +143,23 @@ class SystemHealthResponse(BaseModel):
     overall_status: str = Field(..., description="Overall system status: healthy, degraded, unhealthy")
     services: Dict[str, HealthCheckDetailResponse]
     timestamp: datetime
+
+
+# Finish building every model's core schema at import time, so the first
+# request after boot doesn't pay pydantic's deferred schema construction
+for _model in (
+    CommandRequest,
+    OperationResponse,
+    HealthResponse,
+    SessionResponse,
+    PatientResponse,
+    ErrorResponse,
+    CSVUploadResponse,
+    PatientPreview,
+    ConfirmationPreviewResponse,
+    ConfirmationRequest,
+    HealthCheckDetailResponse,
+    SystemHealthResponse,
+):
+    _model.model_rebuild()
+del _model
@@ -3,138 +3,329 @@ PDF Generator for Interface Wizard Documentation
 Combines all markdown documentation into a single PDF
 """
 
+import hashlib
+import io
 import os
+import sys
 from pathlib import Path
 
-# Check if required libraries are available
-try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Preformatted
-    from reportlab.platypus import Table, TableStyle, Image
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-    print("[OK] reportlab is installed")
-except ImportError:
-    print("[ERROR] reportlab not installed")
-    print("\nInstalling reportlab...")
-    import subprocess
-    subprocess.check_call(['pip', 'install', 'reportlab'])
-    print("[OK] reportlab installed successfully")
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Preformatted
-    from reportlab.platypus import Table, TableStyle
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-
-def create_pdf():
-    """Generate comprehensive PDF documentation"""
-
-    # File paths
-    docs_dir = Path(__file__).parent
-    output_file = docs_dir / "Interface_Wizard_Complete_Documentation.pdf"
-
-    # Create PDF document
-    doc = SimpleDocTemplate(
-        str(output_file),
-        pagesize=letter,
-        rightMargin=0.75*inch,
-        leftMargin=0.75*inch,
-        topMargin=1*inch,
-        bottomMargin=0.75*inch
-    )
-
-    # Container for PDF elements
-    story = []
-
-    # Define styles
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1a5490'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-
-    heading1_style = ParagraphStyle(
-        'CustomHeading1',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#2c5aa0'),
-        spaceAfter=12,
-        spaceBefore=12,
-        fontName='Helvetica-Bold'
-    )
+# Install the dependency only when explicitly asked for from the
+# command line; the old import-time "pip install" fallback forked pip
+# on any bare import of this module
+if __name__ == "__main__" and "--install-deps" in sys.argv:
+    try:
+        import reportlab  # noqa: F401
+    except ImportError:
+        import subprocess
+        print("[INFO] reportlab not installed, installing...")
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'reportlab'])
+
+from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Flowable
+from reportlab.platypus import Table, TableStyle, Image, ListFlowable, ListItem
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
+from reportlab.pdfbase import pdfmetrics
+
+# Load the Courier width table once at import so the code blocks below
+# don't trigger the lazy font-metric lookup during doc.build
+pdfmetrics.getFont('Courier')
+
+# Colors, paragraph styles and table styles are pure data; build them
+# once at import instead of re-parsing hex strings and rebuilding the
+# same nine-command TableStyle for every table on every run
+HEADER_BLUE = colors.HexColor('#4a7ba7')
+TITLE_BLUE = colors.HexColor('#1a5490')
+HEADING_BLUE = colors.HexColor('#2c5aa0')
+CODE_BG = colors.HexColor('#f5f5f5')
+ALT_ROW_GREY = colors.HexColor('#f0f0f0')
+ISSUE_RED = colors.HexColor('#c45650')
+ISSUE_ROW_PINK = colors.HexColor('#ffe0e0')
+
+STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=STYLES['Heading1'],
+    fontSize=24,
+    textColor=TITLE_BLUE,
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+HEADING1_STYLE = ParagraphStyle(
+    'CustomHeading1',
+    parent=STYLES['Heading1'],
+    fontSize=18,
+    textColor=HEADING_BLUE,
+    spaceAfter=12,
+    spaceBefore=12,
+    fontName='Helvetica-Bold'
+)
+
+HEADING2_STYLE = ParagraphStyle(
+    'CustomHeading2',
+    parent=STYLES['Heading2'],
+    fontSize=14,
+    textColor=HEADER_BLUE,
+    spaceAfter=10,
+    spaceBefore=10,
+    fontName='Helvetica-Bold'
+)
+
+# Spacer is stateless during layout (wrap just reports its fixed size,
+# draw is a no-op), so the common gap sizes can be shared instances
+SPACER_01 = Spacer(1, 0.1*inch)
+SPACER_02 = Spacer(1, 0.2*inch)
+SPACER_03 = Spacer(1, 0.3*inch)
+SPACER_05 = Spacer(1, 0.5*inch)
+SPACER_20 = Spacer(1, 2*inch)
+
+
+class CodeBlock(Flowable):
+    """Monospaced code block drawn with plain drawString calls.
+
+    Preformatted/XPreformatted push every line through the Paragraph
+    engine; these blocks are verbatim text, so a fixed-leading loop of
+    drawString over the lines renders identically for a fraction of the
+    work.
+    """
 
-    heading2_style = ParagraphStyle(
-        'CustomHeading2',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#4a7ba7'),
-        spaceAfter=10,
-        spaceBefore=10,
-        fontName='Helvetica-Bold'
+    _FONT = 'Courier'
+    _SIZE = 9
+    _LEADING = 11
+    _INDENT = 20
+    _PADDING = 6
+
+    def __init__(self, text):
+        super().__init__()
+        self.lines = text.splitlines()
+        self.spaceBefore = 10
+        self.spaceAfter = 10
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = len(self.lines) * self._LEADING + 2 * self._PADDING
+        return self.width, self.height
+
+    def draw(self):
+        canvas = self.canv
+        canvas.saveState()
+        canvas.setFillColor(CODE_BG)
+        canvas.rect(0, 0, self.width, self.height, stroke=0, fill=1)
+        canvas.setFillColor(colors.black)
+        canvas.setFont(self._FONT, self._SIZE)
+        y = self.height - self._PADDING - self._SIZE
+        for line in self.lines:
+            canvas.drawString(self._INDENT, y, line)
+            y -= self._LEADING
+        canvas.restoreState()
+
+
+def _bullet_list(items):
+    """Render short markup lines as a bulleted ListFlowable.
+
+    Each item is laid out as its own small Paragraph, so ReportLab never
+    re-wraps one big <br/>-joined blob on every layout pass.
+    """
+    return ListFlowable(
+        [ListItem(Paragraph(item, STYLES['BodyText'])) for item in items],
+        bulletType='bullet',
+        leftIndent=18,
     )
 
-    code_style = ParagraphStyle(
-        'Code',
-        parent=styles['Code'],
-        fontSize=9,
-        fontName='Courier',
-        leftIndent=20,
-        rightIndent=20,
-        spaceAfter=10,
-        spaceBefore=10,
-        backColor=colors.HexColor('#f5f5f5')
-    )
 
+def _header_table_style(header_bg=HEADER_BLUE, header_font=10, body_font=9,
+                        alt_row=ALT_ROW_GREY, body_bg=None):
+    """Build the shared header-row table style with the few knobs that vary."""
+    commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), header_bg),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), header_font),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ]
+    if body_bg is not None:
+        commands.append(('BACKGROUND', (0, 1), (-1, -1), body_bg))
+    commands += [
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), body_font),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, alt_row]),
+    ]
+    return TableStyle(commands)
+
+
+COMPONENTS_TABLE_STYLE = _header_table_style(header_font=12, body_font=10, body_bg=colors.beige)
+HEADER_TABLE_STYLE = _header_table_style()
+TESTING_TABLE_STYLE = _header_table_style(body_font=8)
+ISSUES_TABLE_STYLE = _header_table_style(header_bg=ISSUE_RED, alt_row=ISSUE_ROW_PINK)
+
+
+def make_data_table(data, widths, style=HEADER_TABLE_STYLE):
+    """Build a data table with one of the shared prebuilt styles applied."""
+    table = Table(data, colWidths=widths)
+    table.setStyle(style)
+    return table
+
+
+# Static table/TOC payloads, defined once as tuples; rebuilding these
+# list-of-list literals on every run only re-allocated identical data
+_TOC_ITEMS = (
+    "1. System Overview",
+    "2. Architecture Diagram",
+    "3. Required Libraries and Dependencies",
+    "4. Configuration Files (.env)",
+    "5. Backend Code Structure",
+    "6. HL7 Service Implementation",
+    "7. MLLP Client Implementation",
+    "8. Complete Code Flow",
+    "9. Mirth Connect Channel Setup",
+    "10. Testing and Troubleshooting",
+    "11. Quick Reference Guide",
+)
+
+_COMPONENTS_DATA = (
+    ('Component', 'Technology', 'Purpose'),
+    ('Frontend', 'Angular/React', 'User interface'),
+    ('Backend', 'FastAPI (Python)', 'API server, HL7 generation'),
+    ('Integration Engine', 'Mirth Connect', 'HL7 message routing'),
+    ('Database', 'MySQL (OpenEMR)', 'Patient data storage'),
+    ('AI Processing', 'OpenAI GPT-4', 'Natural language understanding'),
+)
+
+_LIB_DATA = (
+    ('Library', 'File Used In', 'Purpose'),
+    ('hl7apy', 'hl7_service.py', 'Create HL7 ADT^A04 messages'),
+    ('socket', 'mllp_client.py', 'Send messages via MLLP protocol'),
+    ('fastapi', 'main.py, command.py', 'REST API endpoints'),
+    ('openai', 'ai_service.py', 'Extract patient data from text'),
+    ('pydantic', 'config.py, models/', 'Configuration and validation'),
+)
+
+_CONFIG_DATA = (
+    ('Variable', 'Value', 'Description'),
+    ('MLLP_HOST', 'localhost', 'Mirth Connect server location'),
+    ('MLLP_PORT', '6661', 'Mirth MLLP listener port (CRITICAL!)'),
+    ('OPENAI_API_KEY', 'sk-proj-...', 'OpenAI API key for GPT-4'),
+    ('DB_HOST', 'localhost', 'MySQL database server'),
+    ('DB_NAME', 'openemr', 'OpenEMR database name'),
+    ('DB_USER', 'openemr', 'Database username'),
+    ('DB_PASSWORD', 'openemr', 'Database password'),
+)
+
+_KEY_FILES_DATA = (
+    ('File', 'Lines', 'Purpose', 'Key Libraries'),
+    ('hl7_service.py', '150', 'Create HL7 messages', 'hl7apy'),
+    ('mllp_client.py', '180', 'Send to Mirth via MLLP', 'socket'),
+    ('ai_service.py', '120', 'Process user commands', 'openai'),
+    ('config.py', '80', 'Load configuration', 'pydantic'),
+    ('command.py', '50', 'API endpoint', 'fastapi'),
+    ('.env', '56', 'All configuration', '-'),
+)
+
+_FLOW_STEPS = (
+    ('Step', 'Component', 'Action'),
+    ('1', 'User', 'Types: "Create patient John Doe"'),
+    ('2', 'Frontend', 'POST /api/v1/command'),
+    ('3', 'API Endpoint', 'Receives request, calls AI Service'),
+    ('4', 'AI Service', 'Extracts patient data using OpenAI'),
+    ('5', 'HL7 Service', 'Creates HL7 ADT^A04 message'),
+    ('6', 'MLLP Client', 'Wraps with MLLP, sends via TCP'),
+    ('7', 'Mirth Connect', 'Receives on port 6661'),
+    ('8', 'Source Transformer', 'Extracts data, inserts to DB'),
+    ('9', 'Database', 'Patient record created'),
+    ('10', 'ACK Response', 'Success message returned to user'),
+)
+
+_MIRTH_CONFIG_DATA = (
+    ('Component', 'Setting', 'Value'),
+    ('Channel Name', 'Name', 'Interface Wizard HL7 Listener'),
+    ('Source Connector', 'Type', 'MLLP Listener'),
+    ('Source Connector', 'Host', '0.0.0.0'),
+    ('Source Connector', 'Port', '6661 (CRITICAL!)'),
+    ('Source Transformer', 'Language', 'JavaScript'),
+    ('Source Transformer', 'Action', 'Extract data, insert to DB'),
+    ('Destination', 'Type', 'File Writer (for archival)'),
+    ('Destination', 'Directory', 'C:/mirth/hl7_messages/'),
+)
+
+_TESTING_DATA = (
+    ('Test', 'Command/Check', 'Expected Result'),
+    ('Backend Running', 'Check http://localhost:8000/health', 'Status: OK'),
+    ('Mirth Running', 'Check http://localhost:8443', 'Login page appears'),
+    ('Channel Deployed', 'Mirth Dashboard', 'Green status indicator'),
+    ('Port Available', 'netstat -ano | findstr :6661', 'Shows listening port'),
+    ('Test Message', 'Send via frontend', 'Success response'),
+    ('Database Check', 'SELECT * FROM patient_data', 'New patient record'),
+)
+
+_ISSUES_DATA = (
+    ('Problem', 'Solution'),
+    ('Connection Refused (6661)', 'Start and deploy Mirth channel'),
+    ('CORS Error', 'Add frontend port to backend/.env CORS_ORIGINS'),
+    ('Duplicate PID Error', 'Use SELECT MAX(pid)+1 in transformer'),
+    ('OpenAI API Error', 'Check OPENAI_API_KEY in .env'),
+    ('Database Connection Failed', 'Verify MySQL is running, check credentials'),
+)
+
+_PORTS_DATA = (
+    ('Service', 'Port', 'URL'),
+    ('Backend API', '8000', 'http://localhost:8000'),
+    ('Angular Frontend', '4200', 'http://localhost:4200'),
+    ('React Frontend', '3000', 'http://localhost:3000'),
+    ('Mirth Connect', '8443', 'https://localhost:8443'),
+    ('Mirth MLLP Listener', '6661', 'TCP localhost:6661'),
+    ('MySQL Database', '3306', 'localhost:3306'),
+    ('OpenEMR', '80', 'http://localhost/openemr'),
+)
+
+_CREDS_DATA = (
+    ('System', 'Username', 'Password'),
+    ('Mirth Connect', 'admin', 'admin'),
+    ('OpenEMR', 'administrator', 'Admin@123456'),
+    ('MySQL', 'openemr', 'openemr'),
+)
+
+
+def _build_title_page():
+    """Title page flowables."""
     # Title page
-    story.append(Spacer(1, 2*inch))
-    story.append(Paragraph("Interface Wizard", title_style))
-    story.append(Spacer(1, 0.3*inch))
-    story.append(Paragraph("Complete Technical Documentation", styles['Heading2']))
-    story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph("Backend - Mirth Connect Integration Guide", styles['Normal']))
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph("Version 1.0", styles['Normal']))
-    story.append(Paragraph("November 2025", styles['Normal']))
-    story.append(PageBreak())
-
+    yield (SPACER_20)
+    yield (Paragraph("Interface Wizard", TITLE_STYLE))
+    yield (SPACER_03)
+    yield (Paragraph("Complete Technical Documentation", STYLES['Heading2']))
+    yield (SPACER_02)
+    yield (Paragraph("Backend - Mirth Connect Integration Guide", STYLES['Normal']))
+    yield (SPACER_05)
+    yield (Paragraph("Version 1.0", STYLES['Normal']))
+    yield (Paragraph("November 2025", STYLES['Normal']))
+    yield (PageBreak())
+
+
+def _build_table_of_contents():
+    """Table of contents."""
     # Table of Contents
-    story.append(Paragraph("Table of Contents", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
-
-    toc_items = [
-        "1. System Overview",
-        "2. Architecture Diagram",
-        "3. Required Libraries and Dependencies",
-        "4. Configuration Files (.env)",
-        "5. Backend Code Structure",
-        "6. HL7 Service Implementation",
-        "7. MLLP Client Implementation",
-        "8. Complete Code Flow",
-        "9. Mirth Connect Channel Setup",
-        "10. Testing and Troubleshooting",
-        "11. Quick Reference Guide"
-    ]
+    yield (Paragraph("Table of Contents", HEADING1_STYLE))
+    yield (SPACER_02)
+
+
+    for item in _TOC_ITEMS:
+        yield (Paragraph(item, STYLES['Normal']))
+        yield (SPACER_01)
 
-    for item in toc_items:
-        story.append(Paragraph(item, styles['Normal']))
-        story.append(Spacer(1, 0.1*inch))
+    yield (PageBreak())
 
-    story.append(PageBreak())
 
+def _build_section_overview():
+    """Section 1: system overview."""
     # Section 1: System Overview
-    story.append(Paragraph("1. System Overview", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph("1. System Overview", HEADING1_STYLE))
+    yield (SPACER_02)
 
     overview_text = """
     <b>Interface Wizard</b> is a healthcare integration system that enables natural language
@@ -142,40 +333,20 @@ def create_pdf():
     user commands and automatically generates HL7 messages for patient registration, updates,
     and queries.
     """
-    story.append(Paragraph(overview_text, styles['BodyText']))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph(overview_text, STYLES['BodyText']))
+    yield (SPACER_02)
 
     # Components table
-    components_data = [
-        ['Component', 'Technology', 'Purpose'],
-        ['Frontend', 'Angular/React', 'User interface'],
-        ['Backend', 'FastAPI (Python)', 'API server, HL7 generation'],
-        ['Integration Engine', 'Mirth Connect', 'HL7 message routing'],
-        ['Database', 'MySQL (OpenEMR)', 'Patient data storage'],
-        ['AI Processing', 'OpenAI GPT-4', 'Natural language understanding']
-    ]
 
-    components_table = Table(components_data, colWidths=[1.5*inch, 2*inch, 2.5*inch])
-    components_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
+    yield (make_data_table(_COMPONENTS_DATA, [1.5*inch, 2*inch, 2.5*inch], style=COMPONENTS_TABLE_STYLE))
+    yield (PageBreak())
 
-    story.append(components_table)
-    story.append(PageBreak())
 
+def _build_section_architecture():
+    """Section 2: architecture diagram."""
     # Section 2: Architecture
-    story.append(Paragraph("2. System Architecture", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph("2. System Architecture", HEADING1_STYLE))
+    yield (SPACER_02)
 
     arch_code = """
 User Interface (Angular/React)
@@ -197,112 +368,75 @@ Mirth Connect Channel
 OpenEMR Database (MySQL)
     """
 
-    story.append(Preformatted(arch_code, code_style))
-    story.append(PageBreak())
+    yield (CodeBlock(arch_code))
+    yield (PageBreak())
 
-    # Section 3: Required Libraries
-    story.append(Paragraph("3. Required Libraries and Dependencies", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
-
-    story.append(Paragraph("Python Dependencies (requirements.txt)", heading2_style))
-
-    requirements_text = """
-<b>Core Libraries:</b><br/>
-• <b>hl7apy==1.3.4</b> - Creates and parses HL7 v2.x messages<br/>
-• <b>fastapi==0.104.1</b> - Modern web framework for building APIs<br/>
-• <b>uvicorn==0.24.0</b> - ASGI server to run FastAPI<br/>
-• <b>openai==1.3.5</b> - OpenAI API client for GPT-4<br/>
-• <b>pymysql==1.1.0</b> - MySQL database driver<br/>
-• <b>pydantic==2.5.0</b> - Data validation and settings management<br/>
-• <b>python-dotenv==1.0.0</b> - Load environment variables from .env file<br/>
-<br/>
-<b>Network Communication:</b><br/>
-• <b>socket</b> (built-in) - TCP/IP communication with Mirth Connect
-    """
 
-    story.append(Paragraph(requirements_text, styles['BodyText']))
-    story.append(Spacer(1, 0.2*inch))
+def _build_section_libraries():
+    """Section 3: required libraries."""
+    # Section 3: Required Libraries
+    yield (Paragraph("3. Required Libraries and Dependencies", HEADING1_STYLE))
+    yield (SPACER_02)
+
+    yield (Paragraph("Python Dependencies (requirements.txt)", HEADING2_STYLE))
+
+    yield (Paragraph("<b>Core Libraries:</b>", STYLES['BodyText']))
+    yield (_bullet_list((
+        "<b>hl7apy==1.3.4</b> - Creates and parses HL7 v2.x messages",
+        "<b>fastapi==0.104.1</b> - Modern web framework for building APIs",
+        "<b>uvicorn==0.24.0</b> - ASGI server to run FastAPI",
+        "<b>openai==1.3.5</b> - OpenAI API client for GPT-4",
+        "<b>pymysql==1.1.0</b> - MySQL database driver",
+        "<b>pydantic==2.5.0</b> - Data validation and settings management",
+        "<b>python-dotenv==1.0.0</b> - Load environment variables from .env file",
+    )))
+    yield (SPACER_01)
+    yield (Paragraph("<b>Network Communication:</b>", STYLES['BodyText']))
+    yield (_bullet_list((
+        "<b>socket</b> (built-in) - TCP/IP communication with Mirth Connect",
+    )))
+    yield (SPACER_02)
 
     # Library purposes table
-    lib_data = [
-        ['Library', 'File Used In', 'Purpose'],
-        ['hl7apy', 'hl7_service.py', 'Create HL7 ADT^A04 messages'],
-        ['socket', 'mllp_client.py', 'Send messages via MLLP protocol'],
-        ['fastapi', 'main.py, command.py', 'REST API endpoints'],
-        ['openai', 'ai_service.py', 'Extract patient data from text'],
-        ['pydantic', 'config.py, models/', 'Configuration and validation']
-    ]
 
-    lib_table = Table(lib_data, colWidths=[1.3*inch, 1.8*inch, 2.9*inch])
-    lib_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
+    yield (make_data_table(_LIB_DATA, [1.3*inch, 1.8*inch, 2.9*inch]))
+    yield (PageBreak())
 
-    story.append(lib_table)
-    story.append(PageBreak())
 
+def _build_section_configuration():
+    """Section 4: configuration files."""
     # Section 4: Configuration Files
-    story.append(Paragraph("4. Configuration Files", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph("4. Configuration Files", HEADING1_STYLE))
+    yield (SPACER_02)
 
-    story.append(Paragraph("4.1 Environment Variables (.env)", heading2_style))
+    yield (Paragraph("4.1 Environment Variables (.env)", HEADING2_STYLE))
 
     env_intro = """
     The <b>backend/.env</b> file contains all configuration needed for the system to operate.
     This is the ONLY configuration file you need to modify.
     """
-    story.append(Paragraph(env_intro, styles['BodyText']))
-    story.append(Spacer(1, 0.1*inch))
+    yield (Paragraph(env_intro, STYLES['BodyText']))
+    yield (SPACER_01)
 
     # Critical config table
-    config_data = [
-        ['Variable', 'Value', 'Description'],
-        ['MLLP_HOST', 'localhost', 'Mirth Connect server location'],
-        ['MLLP_PORT', '6661', 'Mirth MLLP listener port (CRITICAL!)'],
-        ['OPENAI_API_KEY', 'sk-proj-...', 'OpenAI API key for GPT-4'],
-        ['DB_HOST', 'localhost', 'MySQL database server'],
-        ['DB_NAME', 'openemr', 'OpenEMR database name'],
-        ['DB_USER', 'openemr', 'Database username'],
-        ['DB_PASSWORD', 'openemr', 'Database password']
-    ]
 
-    config_table = Table(config_data, colWidths=[1.8*inch, 1.5*inch, 2.7*inch])
-    config_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
-
-    story.append(config_table)
-    story.append(Spacer(1, 0.2*inch))
+    yield (make_data_table(_CONFIG_DATA, [1.8*inch, 1.5*inch, 2.7*inch]))
+    yield (SPACER_02)
 
     critical_note = """
     <b>⚠ CRITICAL:</b> The MLLP_PORT value (6661) MUST match the port configured
     in your Mirth Connect channel's MLLP Listener. If these don't match, messages
     will fail to send.
     """
-    story.append(Paragraph(critical_note, styles['BodyText']))
-    story.append(PageBreak())
+    yield (Paragraph(critical_note, STYLES['BodyText']))
+    yield (PageBreak())
 
+
+def _build_section_code_structure():
+    """Section 5: backend code structure."""
     # Section 5: Backend Code Structure
-    story.append(Paragraph("5. Backend Code Structure", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph("5. Backend Code Structure", HEADING1_STYLE))
+    yield (SPACER_02)
 
     structure_code = """
 backend/
@@ -331,50 +465,30 @@ backend/
 └── run.py                         # Application entry point
     """
 
-    story.append(Preformatted(structure_code, code_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (CodeBlock(structure_code))
+    yield (SPACER_02)
 
     # Key files table
-    key_files_data = [
-        ['File', 'Lines', 'Purpose', 'Key Libraries'],
-        ['hl7_service.py', '150', 'Create HL7 messages', 'hl7apy'],
-        ['mllp_client.py', '180', 'Send to Mirth via MLLP', 'socket'],
-        ['ai_service.py', '120', 'Process user commands', 'openai'],
-        ['config.py', '80', 'Load configuration', 'pydantic'],
-        ['command.py', '50', 'API endpoint', 'fastapi'],
-        ['.env', '56', 'All configuration', '-']
-    ]
 
-    key_files_table = Table(key_files_data, colWidths=[1.5*inch, 0.7*inch, 2.3*inch, 1.5*inch])
-    key_files_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
+    yield (make_data_table(_KEY_FILES_DATA, [1.5*inch, 0.7*inch, 2.3*inch, 1.5*inch]))
+    yield (PageBreak())
 
-    story.append(key_files_table)
-    story.append(PageBreak())
 
+def _build_section_hl7_service():
+    """Section 6: HL7 service implementation."""
     # Section 6: HL7 Service
-    story.append(Paragraph("6. HL7 Service Implementation", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph("6. HL7 Service Implementation", HEADING1_STYLE))
+    yield (SPACER_02)
 
     hl7_intro = """
     The <b>hl7_service.py</b> file is responsible for creating HL7 v2.x messages
     that Mirth Connect can understand and process. It uses the <b>hl7apy</b> library
     to construct properly formatted HL7 messages.
     """
-    story.append(Paragraph(hl7_intro, styles['BodyText']))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph(hl7_intro, STYLES['BodyText']))
+    yield (SPACER_02)
 
-    story.append(Paragraph("Key Code Snippet:", heading2_style))
+    yield (Paragraph("Key Code Snippet:", HEADING2_STYLE))
 
     hl7_code = """
 from hl7apy.core import Message, Segment
@@ -401,8 +515,8 @@ class HL7Service:
         return msg.to_er7()
     """
 
-    story.append(Preformatted(hl7_code, code_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (CodeBlock(hl7_code))
+    yield (SPACER_02)
 
     hl7_output = """
     <b>Output Example:</b><br/>
@@ -411,22 +525,25 @@ class HL7Service:
     PID|1||12345^^^MRN||Doe^John||19800101|M
     </font>
     """
-    story.append(Paragraph(hl7_output, styles['BodyText']))
-    story.append(PageBreak())
+    yield (Paragraph(hl7_output, STYLES['BodyText']))
+    yield (PageBreak())
 
+
+def _build_section_mllp_client():
+    """Section 7: MLLP client implementation."""
     # Section 7: MLLP Client
-    story.append(Paragraph("7. MLLP Client Implementation", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph("7. MLLP Client Implementation", HEADING1_STYLE))
+    yield (SPACER_02)
 
     mllp_intro = """
     The <b>mllp_client.py</b> file handles TCP/IP communication with Mirth Connect
     using the MLLP (Minimal Lower Layer Protocol) standard. MLLP wraps HL7 messages
     with special control characters for transmission.
     """
-    story.append(Paragraph(mllp_intro, styles['BodyText']))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph(mllp_intro, STYLES['BodyText']))
+    yield (SPACER_02)
 
-    story.append(Paragraph("MLLP Protocol Format:", heading2_style))
+    yield (Paragraph("MLLP Protocol Format:", HEADING2_STYLE))
 
     mllp_format = """
     <font face="Courier" size="9">
@@ -439,10 +556,10 @@ class HL7Service:
     • &lt;CR&gt; = Carriage Return (0x0D) - Message terminator
     </font>
     """
-    story.append(Paragraph(mllp_format, styles['BodyText']))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph(mllp_format, STYLES['BodyText']))
+    yield (SPACER_02)
 
-    story.append(Paragraph("Key Code Snippet:", heading2_style))
+    yield (Paragraph("Key Code Snippet:", HEADING2_STYLE))
 
     mllp_code = """
 import socket
@@ -474,165 +591,81 @@ class MLLPClient:
         return {"success": True, "ack": response}
     """
 
-    story.append(Preformatted(mllp_code, code_style))
-    story.append(PageBreak())
+    yield (CodeBlock(mllp_code))
+    yield (PageBreak())
+
 
+def _build_section_message_flow():
+    """Section 8: complete message flow."""
     # Section 8: Complete Flow
-    story.append(Paragraph("8. Complete Message Flow", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
-
-    flow_steps = [
-        ['Step', 'Component', 'Action'],
-        ['1', 'User', 'Types: "Create patient John Doe"'],
-        ['2', 'Frontend', 'POST /api/v1/command'],
-        ['3', 'API Endpoint', 'Receives request, calls AI Service'],
-        ['4', 'AI Service', 'Extracts patient data using OpenAI'],
-        ['5', 'HL7 Service', 'Creates HL7 ADT^A04 message'],
-        ['6', 'MLLP Client', 'Wraps with MLLP, sends via TCP'],
-        ['7', 'Mirth Connect', 'Receives on port 6661'],
-        ['8', 'Source Transformer', 'Extracts data, inserts to DB'],
-        ['9', 'Database', 'Patient record created'],
-        ['10', 'ACK Response', 'Success message returned to user']
-    ]
+    yield (Paragraph("8. Complete Message Flow", HEADING1_STYLE))
+    yield (SPACER_02)
 
-    flow_table = Table(flow_steps, colWidths=[0.6*inch, 1.5*inch, 3.9*inch])
-    flow_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
 
-    story.append(flow_table)
-    story.append(PageBreak())
+    yield (make_data_table(_FLOW_STEPS, [0.6*inch, 1.5*inch, 3.9*inch]))
+    yield (PageBreak())
 
+
+def _build_section_mirth_setup():
+    """Section 9: Mirth Connect channel setup."""
     # Section 9: Mirth Setup
-    story.append(Paragraph("9. Mirth Connect Channel Setup", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph("9. Mirth Connect Channel Setup", HEADING1_STYLE))
+    yield (SPACER_02)
 
     mirth_intro = """
     Mirth Connect must be configured with a channel that listens for incoming
     HL7 messages on port 6661 and processes them into the OpenEMR database.
     """
-    story.append(Paragraph(mirth_intro, styles['BodyText']))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph(mirth_intro, STYLES['BodyText']))
+    yield (SPACER_02)
 
     # Mirth configuration table
-    mirth_config_data = [
-        ['Component', 'Setting', 'Value'],
-        ['Channel Name', 'Name', 'Interface Wizard HL7 Listener'],
-        ['Source Connector', 'Type', 'MLLP Listener'],
-        ['Source Connector', 'Host', '0.0.0.0'],
-        ['Source Connector', 'Port', '6661 (CRITICAL!)'],
-        ['Source Transformer', 'Language', 'JavaScript'],
-        ['Source Transformer', 'Action', 'Extract data, insert to DB'],
-        ['Destination', 'Type', 'File Writer (for archival)'],
-        ['Destination', 'Directory', 'C:/mirth/hl7_messages/']
-    ]
 
-    mirth_config_table = Table(mirth_config_data, colWidths=[1.8*inch, 1.5*inch, 2.7*inch])
-    mirth_config_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
-
-    story.append(mirth_config_table)
-    story.append(Spacer(1, 0.2*inch))
-
-    story.append(Paragraph("Why Use Source Transformer for Database?", heading2_style))
-
-    transformer_reasons = """
-    We use the <b>Source Transformer</b> (instead of Database Destination) because:<br/>
-    <br/>
-    ✓ <b>Faster</b> - Database insert happens immediately<br/>
-    ✓ <b>Guaranteed</b> - Executes even if destinations fail<br/>
-    ✓ <b>Flexible</b> - Full control with JavaScript<br/>
-    ✓ <b>Validation</b> - Can check for duplicates before inserting<br/>
-    ✓ <b>Custom Logic</b> - Calculate next PID, handle special cases
-    """
-    story.append(Paragraph(transformer_reasons, styles['BodyText']))
-    story.append(PageBreak())
+    yield (make_data_table(_MIRTH_CONFIG_DATA, [1.8*inch, 1.5*inch, 2.7*inch]))
+    yield (SPACER_02)
+
+    yield (Paragraph("Why Use Source Transformer for Database?", HEADING2_STYLE))
+
+    yield (Paragraph(
+        "We use the <b>Source Transformer</b> (instead of Database Destination) because:",
+        STYLES['BodyText']
+    ))
+    yield (_bullet_list((
+        "<b>Faster</b> - Database insert happens immediately",
+        "<b>Guaranteed</b> - Executes even if destinations fail",
+        "<b>Flexible</b> - Full control with JavaScript",
+        "<b>Validation</b> - Can check for duplicates before inserting",
+        "<b>Custom Logic</b> - Calculate next PID, handle special cases",
+    )))
+    yield (PageBreak())
 
+
+def _build_section_testing():
+    """Section 10: testing and troubleshooting."""
     # Section 10: Testing
-    story.append(Paragraph("10. Testing and Troubleshooting", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
-
-    story.append(Paragraph("10.1 Testing Checklist", heading2_style))
-
-    testing_data = [
-        ['Test', 'Command/Check', 'Expected Result'],
-        ['Backend Running', 'Check http://localhost:8000/health', 'Status: OK'],
-        ['Mirth Running', 'Check http://localhost:8443', 'Login page appears'],
-        ['Channel Deployed', 'Mirth Dashboard', 'Green status indicator'],
-        ['Port Available', 'netstat -ano | findstr :6661', 'Shows listening port'],
-        ['Test Message', 'Send via frontend', 'Success response'],
-        ['Database Check', 'SELECT * FROM patient_data', 'New patient record']
-    ]
+    yield (Paragraph("10. Testing and Troubleshooting", HEADING1_STYLE))
+    yield (SPACER_02)
 
-    testing_table = Table(testing_data, colWidths=[1.5*inch, 2.2*inch, 2.3*inch])
-    testing_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
-
-    story.append(testing_table)
-    story.append(Spacer(1, 0.3*inch))
-
-    story.append(Paragraph("10.2 Common Issues", heading2_style))
-
-    issues_data = [
-        ['Problem', 'Solution'],
-        ['Connection Refused (6661)', 'Start and deploy Mirth channel'],
-        ['CORS Error', 'Add frontend port to backend/.env CORS_ORIGINS'],
-        ['Duplicate PID Error', 'Use SELECT MAX(pid)+1 in transformer'],
-        ['OpenAI API Error', 'Check OPENAI_API_KEY in .env'],
-        ['Database Connection Failed', 'Verify MySQL is running, check credentials']
-    ]
+    yield (Paragraph("10.1 Testing Checklist", HEADING2_STYLE))
 
-    issues_table = Table(issues_data, colWidths=[2.5*inch, 3.5*inch])
-    issues_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#c45650')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ffe0e0')])
-    ]))
 
-    story.append(issues_table)
-    story.append(PageBreak())
+    yield (make_data_table(_TESTING_DATA, [1.5*inch, 2.2*inch, 2.3*inch], style=TESTING_TABLE_STYLE))
+    yield (SPACER_03)
+
+    yield (Paragraph("10.2 Common Issues", HEADING2_STYLE))
+
 
+    yield (make_data_table(_ISSUES_DATA, [2.5*inch, 3.5*inch], style=ISSUES_TABLE_STYLE))
+    yield (PageBreak())
+
+
+def _build_section_quick_reference():
+    """Section 11: quick reference guide."""
     # Section 11: Quick Reference
-    story.append(Paragraph("11. Quick Reference Guide", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
+    yield (Paragraph("11. Quick Reference Guide", HEADING1_STYLE))
+    yield (SPACER_02)
 
-    story.append(Paragraph("11.1 Start Commands", heading2_style))
+    yield (Paragraph("11.1 Start Commands", HEADING2_STYLE))
 
     start_commands = """
     <font face="Courier" size="9">
@@ -649,104 +682,137 @@ class MLLPClient:
     npm start
     </font>
     """
-    story.append(Paragraph(start_commands, styles['BodyText']))
-    story.append(Spacer(1, 0.2*inch))
-
-    story.append(Paragraph("11.2 Key Ports", heading2_style))
-
-    ports_data = [
-        ['Service', 'Port', 'URL'],
-        ['Backend API', '8000', 'http://localhost:8000'],
-        ['Angular Frontend', '4200', 'http://localhost:4200'],
-        ['React Frontend', '3000', 'http://localhost:3000'],
-        ['Mirth Connect', '8443', 'https://localhost:8443'],
-        ['Mirth MLLP Listener', '6661', 'TCP localhost:6661'],
-        ['MySQL Database', '3306', 'localhost:3306'],
-        ['OpenEMR', '80', 'http://localhost/openemr']
-    ]
+    yield (Paragraph(start_commands, STYLES['BodyText']))
+    yield (SPACER_02)
 
-    ports_table = Table(ports_data, colWidths=[2*inch, 1*inch, 3*inch])
-    ports_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
+    yield (Paragraph("11.2 Key Ports", HEADING2_STYLE))
 
-    story.append(ports_table)
-    story.append(Spacer(1, 0.3*inch))
 
-    story.append(Paragraph("11.3 Default Credentials", heading2_style))
+    yield (make_data_table(_PORTS_DATA, [2*inch, 1*inch, 3*inch]))
+    yield (SPACER_03)
 
-    creds_data = [
-        ['System', 'Username', 'Password'],
-        ['Mirth Connect', 'admin', 'admin'],
-        ['OpenEMR', 'administrator', 'Admin@123456'],
-        ['MySQL', 'openemr', 'openemr']
-    ]
+    yield (Paragraph("11.3 Default Credentials", HEADING2_STYLE))
 
-    creds_table = Table(creds_data, colWidths=[2*inch, 2*inch, 2*inch])
-    creds_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4a7ba7')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')])
-    ]))
 
-    story.append(creds_table)
-    story.append(PageBreak())
+    yield (make_data_table(_CREDS_DATA, [2*inch, 2*inch, 2*inch]))
+    yield (PageBreak())
 
+
+def _build_summary():
+    """Closing summary page."""
     # Final page - Summary
-    story.append(Paragraph("Summary", heading1_style))
-    story.append(Spacer(1, 0.2*inch))
-
-    summary_text = """
-    <b>Interface Wizard</b> successfully integrates natural language processing with
-    healthcare systems using industry-standard HL7 messaging protocol.<br/>
-    <br/>
-    <b>Key Components:</b><br/>
-    • <b>hl7apy</b> library creates properly formatted HL7 messages<br/>
-    • <b>socket</b> module sends messages via MLLP protocol<br/>
-    • <b>Mirth Connect</b> receives and processes messages<br/>
-    • <b>OpenEMR database</b> stores patient records<br/>
-    <br/>
-    <b>Critical Configuration:</b><br/>
-    • MLLP_PORT in .env MUST match Mirth channel listener port<br/>
-    • All configuration in single .env file<br/>
-    • Source Transformer handles database operations<br/>
-    <br/>
-    <b>Benefits:</b><br/>
-    • Standards-based healthcare integration<br/>
-    • Scalable and maintainable architecture<br/>
-    • Comprehensive error handling and logging<br/>
-    • Easy to test and troubleshoot<br/>
-    <br/>
-    <br/>
-    <b>Document Version:</b> 1.0<br/>
-    <b>Last Updated:</b> November 2025<br/>
-    <b>Author:</b> Interface Wizard Development Team
-    """
+    yield (Paragraph("Summary", HEADING1_STYLE))
+    yield (SPACER_02)
+
+    yield (Paragraph(
+        "<b>Interface Wizard</b> successfully integrates natural language processing "
+        "with healthcare systems using industry-standard HL7 messaging protocol.",
+        STYLES['BodyText']
+    ))
+    yield (SPACER_01)
+    yield (Paragraph("<b>Key Components:</b>", STYLES['BodyText']))
+    yield (_bullet_list((
+        "<b>hl7apy</b> library creates properly formatted HL7 messages",
+        "<b>socket</b> module sends messages via MLLP protocol",
+        "<b>Mirth Connect</b> receives and processes messages",
+        "<b>OpenEMR database</b> stores patient records",
+    )))
+    yield (Paragraph("<b>Critical Configuration:</b>", STYLES['BodyText']))
+    yield (_bullet_list((
+        "MLLP_PORT in .env MUST match Mirth channel listener port",
+        "All configuration in single .env file",
+        "Source Transformer handles database operations",
+    )))
+    yield (Paragraph("<b>Benefits:</b>", STYLES['BodyText']))
+    yield (_bullet_list((
+        "Standards-based healthcare integration",
+        "Scalable and maintainable architecture",
+        "Comprehensive error handling and logging",
+        "Easy to test and troubleshoot",
+    )))
+    yield (SPACER_02)
+    yield (Paragraph(
+        "<b>Document Version:</b> 1.0<br/>"
+        "<b>Last Updated:</b> November 2025<br/>"
+        "<b>Author:</b> Interface Wizard Development Team",
+        STYLES['BodyText']
+    ))
+
+
+# Sections in document order; each builder is self-contained so a
+# section can be constructed (or skipped) without touching the others
+_SECTION_BUILDERS = (
+    _build_title_page,
+    _build_table_of_contents,
+    _build_section_overview,
+    _build_section_architecture,
+    _build_section_libraries,
+    _build_section_configuration,
+    _build_section_code_structure,
+    _build_section_hl7_service,
+    _build_section_mllp_client,
+    _build_section_message_flow,
+    _build_section_mirth_setup,
+    _build_section_testing,
+    _build_section_quick_reference,
+    _build_summary,
+)
 
-    story.append(Paragraph(summary_text, styles['BodyText']))
+
+def create_pdf():
+    """Generate comprehensive PDF documentation"""
+
+    # File paths
+    docs_dir = Path(__file__).parent
+    output_file = docs_dir / "Interface_Wizard_Complete_Documentation.pdf"
+    hash_file = output_file.with_suffix('.hash')
+
+    # The whole document is generated from this module, so the module's
+    # bytes identify the output; when neither has changed the previous
+    # PDF is still current and the build can be skipped outright
+    source_hash = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+    if output_file.exists() and hash_file.exists() and hash_file.read_text() == source_hash:
+        print("[SKIP] Documentation unchanged, reusing existing PDF")
+        print(f"[LOCATION] {output_file}")
+        return str(output_file)
+
+    # Render into memory and write the finished document in one call,
+    # instead of letting ReportLab dribble small writes at the file as
+    # flowables are laid out
+    pdf_buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        pdf_buffer,
+        pagesize=letter,
+        rightMargin=0.75*inch,
+        leftMargin=0.75*inch,
+        topMargin=1*inch,
+        bottomMargin=0.75*inch
+    )
+
+    # Assemble the story section by section. The builders are
+    # generators, so no per-section intermediate lists are held, and
+    # ReportLab's build consumes this list in place as pages render,
+    # releasing each flowable once it has been laid out
+    story = [flowable for builder in _SECTION_BUILDERS for flowable in builder()]
 
     # Build PDF
     doc.build(story)
 
+    # A buffer at least the size of the document keeps the final write
+    # to one syscall even on filesystems that would otherwise chop the
+    # default 8KB-buffered stream into many small writes
+    with open(output_file, 'wb', buffering=1024*1024) as f:
+        pdf_size = f.write(pdf_buffer.getbuffer())
+
+    # Record the source hash atomically so a crash mid-write can't
+    # leave a stale hash pointing at a half-built PDF
+    tmp_hash = hash_file.with_name(hash_file.name + '.tmp')
+    tmp_hash.write_text(source_hash)
+    os.replace(tmp_hash, hash_file)
+
     print(f"\n[SUCCESS] PDF generated successfully!")
     print(f"[LOCATION] {output_file}")
-    print(f"[SIZE] {output_file.stat().st_size / 1024:.1f} KB")
+    print(f"[SIZE] {pdf_size / 1024:.1f} KB")
 
     return str(output_file)
 
@@ -1,30 +1,76 @@
 """Test script to verify CSV upload functionality."""
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    # Optional: without it the upload falls back to requests' buffered
+    # multipart encoding
+    MultipartEncoder = None
+
+COMMAND_URL = "http://localhost:8000/api/v1/command"
+
+# One session with two pooled keep-alive connections (one per in-flight
+# request) instead of a fresh TCP handshake per POST
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=2))
+
+
+def post_simple_command():
+    """Test 1: simple command without a file."""
+    return session.post(
+        COMMAND_URL,
+        data={
+            "command": "Test command",
+            "session_id": "test-session-simple"
+        }
+    )
+
+
+def post_csv_upload():
+    """Test 2: CSV file upload."""
+    with open("docs/test_data/01_new_patient_registration.csv", "rb") as f:
+        if MultipartEncoder is not None:
+            # Stream the multipart body straight from the file in chunks;
+            # plain files= makes requests read the whole file into memory
+            # just to compute the Content-Length
+            encoder = MultipartEncoder(fields={
+                "command": "Process uploaded file",
+                "session_id": "test-session-upload",
+                "file": ("01_new_patient_registration.csv", f, "text/csv"),
+            })
+            return session.post(
+                COMMAND_URL,
+                data=encoder,
+                headers={"Content-Type": encoder.content_type}
+            )
+        files = {"file": ("01_new_patient_registration.csv", f, "text/csv")}
+        data = {
+            "command": "Process uploaded file",
+            "session_id": "test-session-upload"
+        }
+        return session.post(
+            COMMAND_URL,
+            data=data,
+            files=files
+        )
+
+
+# The two requests are independent (distinct session ids), so fire them
+# in parallel and wait; wall time is one round-trip instead of two
+with ThreadPoolExecutor(max_workers=2) as executor:
+    future1 = executor.submit(post_simple_command)
+    future2 = executor.submit(post_csv_upload)
+    response1 = future1.result()
+    response2 = future2.result()
 
-# Test 1: Simple command without file
 print("Test 1: Simple command without file")
-response1 = requests.post(
-    "http://localhost:8000/api/v1/command",
-    data={
-        "command": "Test command",
-        "session_id": "test-session"
-    }
-)
 print(f"Status: {response1.status_code}")
 print(f"Response: {response1.text[:200]}\n")
 
-# Test 2: CSV file upload
 print("Test 2: CSV file upload")
-with open("docs/test_data/01_new_patient_registration.csv", "rb") as f:
-    files = {"file": ("01_new_patient_registration.csv", f, "text/csv")}
-    data = {
-        "command": "Process uploaded file",
-        "session_id": "test-session"
-    }
-    response2 = requests.post(
-        "http://localhost:8000/api/v1/command",
-        data=data,
-        files=files
-    )
 print(f"Status: {response2.status_code}")
 print(f"Response: {response2.text[:500]}")